@@ -0,0 +1,102 @@
+"""Decode time per exchange orderbook payload.
+
+Compares the decoders accepted by riem.Client on synthetic payloads shaped
+like each exchange's orderbook response, and the cost of keeping the body
+undecoded (raw_body=True).
+
+    python benchmarks/bench_decode.py
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import timeit
+
+from riem import OrderbookConverter
+from riem.decoders import RawBody, get_decoder
+
+
+def _levels(mid: float, n: int, sign: int) -> list[tuple[str, str]]:
+    return [
+        (f"{mid + sign * (i + 1) * 0.5:.1f}", f"{random.uniform(0.001, 3):.4f}")
+        for i in range(n)
+    ]
+
+
+def gmocoin_payload(depth: int) -> bytes:
+    return json.dumps(
+        {
+            "status": 0,
+            "data": {
+                "asks": [{"price": p, "size": s} for p, s in _levels(1e7, depth, 1)],
+                "bids": [{"price": p, "size": s} for p, s in _levels(1e7, depth, -1)],
+                "symbol": "BTC",
+            },
+            "responsetime": "2024-01-01T00:00:00.000Z",
+        }
+    ).encode()
+
+
+def bitbank_payload(depth: int) -> bytes:
+    return json.dumps(
+        {
+            "success": 1,
+            "data": {
+                "asks": _levels(1e7, depth, 1),
+                "bids": _levels(1e7, depth, -1),
+                "timestamp": 1700000000000,
+                "sequenceId": "1",
+            },
+        }
+    ).encode()
+
+
+def bybit_payload(depth: int) -> bytes:
+    return json.dumps(
+        {
+            "retCode": 0,
+            "result": {
+                "s": "BTCUSDT",
+                "a": _levels(4e4, depth, 1),
+                "b": _levels(4e4, depth, -1),
+                "ts": 1700000000000,
+                "u": 1,
+            },
+            "time": 1700000000000,
+        }
+    ).encode()
+
+
+def bench(number: int = 2000) -> None:
+
+    payloads = {
+        "gmocoin": gmocoin_payload(100),
+        "bitbank": bitbank_payload(200),
+        "bybit": bybit_payload(200),
+    }
+
+    decoders = {"json": get_decoder("json")}
+    try:
+        decoders["orjson"] = get_decoder("orjson")
+    except ImportError:
+        print("orjson is not installed, skipped.")
+
+    conv = OrderbookConverter(length=10)
+
+    print(f"{'exchange':<10}{'bytes':>8}{'decoder':>10}{'decode us':>12}{'format us':>12}")
+    for en, body in payloads.items():
+        for name, decoder in decoders.items():
+            decode = timeit.timeit(lambda: decoder(body), number=number) / number
+
+            data = decoder(body)
+            fmt = timeit.timeit(lambda: conv.handle(en, data), number=number) / number
+
+            print(f"{en:<10}{len(body):>8}{name:>10}{decode * 1e6:>12.1f}{fmt * 1e6:>12.1f}")
+
+        raw = timeit.timeit(lambda: RawBody(body, decoders["json"]), number=number)
+        print(f"{en:<10}{len(body):>8}{'raw':>10}{raw / number * 1e6:>12.1f}{'-':>12}")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,75 @@
+"""Cost of building a ClientResponseProxy from n responses.
+
+Compares the previous `crp += ClientResponseProxy(...)` pattern (O(n^2))
+with ClientResponseProxy.append (O(1) per response), and times
+Formatter.format, which is built on append.
+
+    python benchmarks/bench_proxy.py
+"""
+
+from __future__ import annotations
+
+import time
+
+from riem import ClientResponse, ClientResponseProxy, Formatter, ModelIdentifier
+
+
+def make_responses(n: int) -> list[ClientResponse]:
+
+    model_ids = [
+        ModelIdentifier(
+            exchange_name="gmocoin", data_type="orderbooks", arguments={"symbol": f"S{i}"}
+        )
+        for i in range(100)
+    ]
+
+    return [
+        ClientResponse(model_identifier=model_ids[i % 100], acq_source="HTTP", raw_data={})
+        for i in range(n)
+    ]
+
+
+def build_add(responses: list[ClientResponse]) -> ClientResponseProxy:
+
+    crp = ClientResponseProxy(responses=[], mapping=False)
+    for r in responses:
+        crp += ClientResponseProxy(responses=[r], mapping=False)
+    crp.remap_hash_idxs()
+
+    return crp
+
+
+def build_append(responses: list[ClientResponse]) -> ClientResponseProxy:
+
+    crp = ClientResponseProxy(responses=[])
+    for r in responses:
+        crp.append(r)
+
+    return crp
+
+
+def timed(f, *args) -> float:
+
+    start = time.perf_counter()
+    f(*args)
+    return time.perf_counter() - start
+
+
+def bench() -> None:
+
+    fmt = Formatter()
+
+    print(f"{'n':>8}{'+= us/resp':>14}{'append us/resp':>16}{'format us/resp':>16}")
+    for n in (1_000, 5_000, 10_000, 50_000, 100_000):
+        responses = make_responses(n)
+
+        # the quadratic path takes minutes beyond this size
+        add = f"{timed(build_add, responses) / n * 1e6:.2f}" if n <= 5_000 else "-"
+        append = timed(build_append, responses) / n * 1e6
+        formatted = timed(fmt.format, ClientResponseProxy(responses=responses, mapping=False)) / n * 1e6
+
+        print(f"{n:>8}{add:>14}{append:>16.2f}{formatted:>16.2f}")
+
+
+if __name__ == "__main__":
+    bench()
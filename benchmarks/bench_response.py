@@ -0,0 +1,130 @@
+"""Per-response overhead of ClientResponse and Formatter.format.
+
+Compares the slotted ClientResponse and the in-place Formatter with a
+replica of the previous representation: a dataclass with __dict__, a
+datetime timestamp, and one copied response per formatted response.
+Both paths index the formatted proxy, as Formatter.format does.
+
+    python benchmarks/bench_response.py
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import time
+import tracemalloc
+from typing import Any
+
+from riem import ClientResponse, ClientResponseProxy, Formatter, ModelIdentifier
+
+N = 10_000
+
+
+@dataclasses.dataclass
+class LegacyClientResponse:
+
+    model_identifier: ModelIdentifier
+    acq_source: str
+    raw_data: Any
+    formatted_data: Any = None
+
+    modelhash: str = dataclasses.field(init=False)
+    modelkey: int = dataclasses.field(init=False)  # needed by the proxy index
+    ts: float = dataclasses.field(init=False)
+
+    def __post_init__(self) -> None:
+        self.modelhash = self.model_identifier.modelhash
+        self.modelkey = self.model_identifier.modelkey
+        self.ts = datetime.datetime.now().timestamp()
+
+
+def legacy_build(model_ids: list[ModelIdentifier]) -> list[LegacyClientResponse]:
+    return [LegacyClientResponse(m, "HTTP", {}) for m in model_ids]
+
+
+def legacy_format(raw: list[LegacyClientResponse]) -> ClientResponseProxy:
+
+    copied = [
+        LegacyClientResponse(r.model_identifier, r.acq_source, r.raw_data, None)
+        for r in raw
+    ]
+    return ClientResponseProxy(responses=copied)
+
+
+def current_build(model_ids: list[ModelIdentifier]) -> list[ClientResponse]:
+    return [
+        ClientResponse(model_identifier=m, acq_source="HTTP", raw_data={})
+        for m in model_ids
+    ]
+
+
+def current_format(raw: list[ClientResponse], fmt: Formatter) -> ClientResponseProxy:
+    return fmt.format(ClientResponseProxy(responses=raw, mapping=False))
+
+
+def best_of(f, *args, repeat: int = 5) -> float:
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f(*args)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def retained(f, *args) -> tuple[int, int]:
+    """Bytes kept alive by the result and bytes allocated at peak."""
+
+    tracemalloc.start()
+    result = f(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+    return current, peak
+
+
+def bench() -> None:
+
+    model_ids = [
+        ModelIdentifier(
+            exchange_name="gmocoin", data_type="orderbooks", arguments={"symbol": f"S{i % 100}"}
+        )
+        for i in range(N)
+    ]
+    fmt = Formatter()
+
+    legacy_raw = legacy_build(model_ids)
+    current_raw = current_build(model_ids)
+
+    rows = {
+        "legacy": (
+            best_of(legacy_build, model_ids),
+            best_of(legacy_format, legacy_raw),
+            retained(legacy_build, model_ids),
+            retained(legacy_format, legacy_raw)[1],
+        ),
+        "current": (
+            best_of(current_build, model_ids),
+            best_of(current_format, current_raw, fmt),
+            retained(current_build, model_ids),
+            retained(current_format, current_raw, fmt)[1],
+        ),
+    }
+
+    print(f"{N} responses")
+    print(
+        f"{'':<10}{'build us':>10}{'format us':>11}"
+        f"{'build B/resp':>14}{'format peak B/resp':>20}"
+    )
+    for name, (build, format_, (kept, _), peak) in rows.items():
+        print(
+            f"{name:<10}{build / N * 1e6:>10.2f}{format_ / N * 1e6:>11.2f}"
+            f"{kept / N:>14.0f}{peak / N:>20.0f}"
+        )
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,51 @@
+"""Average fill price of many order sizes.
+
+Compares Book.avg_price_for and Book.avg_price_for_books with calling the
+scalar Book.calc_avg_acq_price once per size, on synthetic depth-50 books.
+
+    python benchmarks/bench_slippage.py
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+import numpy as np
+
+from riem import Book
+
+DEPTH = 50
+BOOKS = 1_000
+AMOUNTS = np.linspace(0.01, 20, 64)
+
+
+def make_book() -> Book:
+    return Book(
+        [
+            (f"{1e7 + (i + 1) * 0.5:.1f}", f"{random.uniform(0.001, 3):.4f}")
+            for i in range(DEPTH)
+        ]
+    )
+
+
+def bench() -> None:
+
+    books = [make_book() for _ in range(BOOKS)]
+    for b in books:
+        b.cum_notional  # parse and accumulate outside the timed loops
+
+    scalar = timeit.timeit(
+        lambda: [[b.calc_avg_acq_price(a) for a in AMOUNTS] for b in books], number=1
+    )
+    per_book = timeit.timeit(lambda: [b.avg_price_for(AMOUNTS) for b in books], number=1)
+    batched = timeit.timeit(lambda: Book.avg_price_for_books(books, AMOUNTS), number=1)
+
+    print(f"{BOOKS} books x {len(AMOUNTS)} sizes, depth {DEPTH}")
+    print(f"{'scalar calc_avg_acq_price':<28}{scalar * 1e3:>10.1f} ms")
+    print(f"{'avg_price_for per book':<28}{per_book * 1e3:>10.1f} ms")
+    print(f"{'avg_price_for_books':<28}{batched * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    bench()
@@ -1,5 +1,14 @@
 from .client import Client
+from .batch import RequestBatch
+from .ratelimit import RateLimit, RateLimiter, TokenBucket
+from .cache import ResponseCache
+from .store import ResponseStore
+from .consolidated import ConsolidatedOrderbook
+from .breaker import CircuitBreaker, CircuitBreakerRegistry
+from .hedge import Hedger
+from .decoders import RawBody, get_decoder
 from .response import ClientResponse, ClientResponseProxy
+from .timing import StageTimings
 from .fmt import Formatter
 from .dbclient import DatabaseClient
 from .mi import ModelInterface
@@ -16,6 +25,7 @@ from .formats.converter import Converter
 
 from .formats.molds.orderbook import Orderbook, Book
 from .formats.orderbook import OrderbookConverter
+from .formats.ticks import TickRegistry, TickSize
 
 from .formats.molds.asset import Asset
 from .formats.asset import AssetConverter
@@ -29,3 +39,10 @@ from .formats.ticker import TickerConverter
 # database
 from .database.base import Base
 from .database.database import Database
+
+# streams
+from .streams.core import LocalBook, OrderbookChannel
+from .streams.gmocoin import GmocoinOrderbookChannel
+from .streams.bitbank import BitbankOrderbookChannel
+from .streams.bybit import BybitOrderbookChannel
+from .streams.stream import OrderbookStream
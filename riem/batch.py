@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import dataclasses
+import itertools
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from .models.core import RequestContents
+
+
+@dataclasses.dataclass(frozen=True)
+class RequestBatch:
+    """RequestBatch
+
+    Immutable, reusable set of requests (再利用可能なリクエストの集合).
+    Compile a fixed request set once and pass it to `Client.paralell_fetch`
+    on every polling cycle. No request is rebuilt between cycles.
+
+    Attributes:
+        requests (tuple[RequestContents, ...]): Requests in the given order.
+            They are shared between cycles and must not be mutated.
+
+        hosts (dict[str, tuple[int, ...]]): Request indices per host.
+        launch_order (tuple[int, ...]): Request indices interleaved round-robin
+            across hosts, so that one host's requests don't hold up another's.
+
+    """
+
+    requests: tuple[RequestContents, ...]
+
+    hosts: dict[str, tuple[int, ...]] = dataclasses.field(init=False, repr=False)
+    launch_order: tuple[int, ...] = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+
+        hosts: dict[str, list[int]] = {}
+        for i, rc in enumerate(self.requests):
+            host = urlsplit(rc.http_request_conponents.url).netloc
+            hosts.setdefault(host, []).append(i)
+
+        launch_order = [
+            i
+            for group in itertools.zip_longest(*hosts.values())
+            for i in group
+            if i is not None
+        ]
+
+        object.__setattr__(self, "requests", tuple(self.requests))
+        object.__setattr__(self, "hosts", {h: tuple(idxs) for h, idxs in hosts.items()})
+        object.__setattr__(self, "launch_order", tuple(launch_order))
+
+    @classmethod
+    def compile(cls, *rcs: RequestContents) -> RequestBatch:
+        return cls(requests=rcs)
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    def __iter__(self) -> Iterator[RequestContents]:
+        return iter(self.requests)
+
+    def __getitem__(self, index: int) -> RequestContents:
+        return self.requests[index]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import collections
+import time
+from typing import Literal
+
+from .models.core import RequestContents
+
+State = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """CircuitBreaker
+
+    Circuit breaker for one exchange or endpoint (サーキットブレーカー).
+    Opens when the failure rate of the recent calls exceeds `failure_rate`,
+    fails fast while open, and lets `half_open_calls` probes through once
+    `open_timeout` has elapsed. A successful probe closes it again; a probe
+    that fails, times out or is cancelled opens it again. Calls that take
+    longer than `call_timeout` are cancelled and count as failures.
+    Every allowed call must be followed by exactly one `record()`.
+
+    Attributes:
+        failure_rate (float): Failure rate that opens the breaker.
+        window (int): Number of recent calls used for the failure rate.
+        min_calls (int): Minimum number of calls before the breaker can open.
+        open_timeout (float): Seconds to stay open before probing.
+        half_open_calls (int): Number of concurrent probes while half-open.
+        call_timeout (float | None): Seconds after which a call is cancelled and
+            recorded as a failure. If None, calls are never timed out.
+
+        state (State): Current state.
+        opened (int): Number of times the breaker opened.
+        rejected (int): Number of calls rejected while open.
+        timeouts (int): Number of calls that exceeded call_timeout.
+
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        open_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        call_timeout: float | None = 10.0,
+    ) -> None:
+
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.open_timeout = open_timeout
+        self.half_open_calls = half_open_calls
+        self.call_timeout = call_timeout
+
+        self.opened = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+        self._state: State = "closed"
+        self._opened_at = 0.0
+        self._probes = 0
+        self._outcomes: collections.deque[bool] = collections.deque(maxlen=window)
+
+    @property
+    def state(self) -> State:
+
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.open_timeout:
+            self._state = "half_open"
+            self._probes = 0
+
+        return self._state
+
+    @property
+    def available(self) -> bool:
+        """Whether a call would currently be allowed."""
+
+        state = self.state
+        if state == "open":
+            return False
+
+        if state == "half_open":
+            return self._probes < self.half_open_calls
+
+        return True
+
+    def allow(self) -> bool:
+
+        if not self.available:
+            self.rejected += 1
+            return False
+
+        if self._state == "half_open":
+            self._probes += 1
+
+        return True
+
+    def record(self, ok: bool) -> None:
+
+        state = self.state
+
+        if state == "half_open":
+            self._probes = max(0, self._probes - 1)
+            if ok:
+                self._close()
+            else:
+                self._open()
+            return
+
+        self._outcomes.append(ok)
+        if state == "closed" and len(self._outcomes) >= self.min_calls:
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def _open(self) -> None:
+
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.opened += 1
+
+    def _close(self) -> None:
+
+        self._state = "closed"
+        self._outcomes.clear()
+
+
+class CircuitBreakerRegistry:
+    """CircuitBreakerRegistry
+
+    Circuit breakers per `ModelIdentifier.exchange_name`
+    (取引所ごとのサーキットブレーカー).
+
+    Attributes:
+        per_endpoint (bool): Whether to keep one breaker per endpoint URL
+            instead of one per exchange.
+        breakers (dict[str | tuple[str, str], CircuitBreaker]): Breakers.
+
+    """
+
+    def __init__(self, per_endpoint: bool = False, **breaker_kwargs) -> None:
+
+        self.per_endpoint = per_endpoint
+        self.breakers: dict[str | tuple[str, str], CircuitBreaker] = {}
+
+        self._breaker_kwargs = breaker_kwargs
+
+    def _key(self, exchange_name: str, url: str | None) -> str | tuple[str, str]:
+
+        if self.per_endpoint and url is not None:
+            return (exchange_name, url)
+
+        return exchange_name
+
+    def breaker(self, rc: RequestContents) -> CircuitBreaker:
+
+        key = self._key(rc.model_identifier.exchange_name, rc.http_request_conponents.url)
+        if key not in self.breakers:
+            self.breakers[key] = CircuitBreaker(**self._breaker_kwargs)
+
+        return self.breakers[key]
+
+    def state(self, exchange_name: str, url: str | None = None) -> State:
+
+        breaker = self.breakers.get(self._key(exchange_name, url))
+        if breaker is None:
+            return "closed"
+
+        return breaker.state
+
+    def available(self, exchange_name: str, url: str | None = None) -> bool:
+        """available
+
+        Whether requests to the exchange (or endpoint) would be allowed.
+        With `per_endpoint` and no url, every endpoint of the exchange must be available.
+
+        """
+
+        if self.per_endpoint and url is None:
+            return all(
+                b.available
+                for key, b in self.breakers.items()
+                if isinstance(key, tuple) and key[0] == exchange_name
+            )
+
+        breaker = self.breakers.get(self._key(exchange_name, url))
+        if breaker is None:
+            return True
+
+        return breaker.available
+
+    @property
+    def states(self) -> dict[str | tuple[str, str], State]:
+        return {key: breaker.state for key, breaker in self.breakers.items()}
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import collections
+import time
+
+from .models.core import ModelIdentifier, as_modelkey
+from .response import ClientResponse
+
+
+class ResponseCache:
+    """ResponseCache
+
+    In-memory TTL cache for formatted responses (レスポンスキャッシュ).
+    Entries are keyed by `ModelIdentifier.modelkey` and evicted in LRU order
+    once `maxsize` is exceeded. Only data types with a TTL are cached.
+
+    Attributes:
+        ttls (dict[str, float]): TTL in seconds per data_type.
+            e.g. {"orderbooks": 0.2, "ticker": 1.0}
+        maxsize (int): Maximum number of entries.
+        hits (int): Number of cache hits.
+        misses (int): Number of cache misses.
+        evictions (int): Number of entries evicted by the LRU policy.
+
+    """
+
+    def __init__(self, ttls: dict[str, float], maxsize: int = 1024) -> None:
+
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+
+        self.ttls = ttls
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # modelkey -> (expires_at, response)
+        self._entries: collections.OrderedDict[int, tuple[float, ClientResponse]] = (
+            collections.OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, modelhash: str | int) -> bool:
+        return as_modelkey(modelhash) in self._entries
+
+    def cacheable(self, model_identifier: ModelIdentifier) -> bool:
+        return model_identifier.data_type in self.ttls
+
+    def get(self, model_identifier: ModelIdentifier) -> ClientResponse | None:
+        """get
+
+        Get a fresh cached response (キャッシュからレスポンスを取得).
+
+        Args:
+            model_identifier (ModelIdentifier): Identifier of the request.
+
+        Returns:
+            ClientResponse | None: Copy of the cached response with
+                acq_source "CACHE", the original ts and a copy of its timings,
+                or None on a miss.
+
+        """
+
+        if not self.cacheable(model_identifier):
+            return None
+
+        key = model_identifier.modelkey
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, cr = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        # the copy has its own timings, so stamping a hit leaves the cached one alone
+        hit = cr.copy()
+        hit.acq_source = "CACHE"
+
+        return hit
+
+    def put(self, cr: ClientResponse) -> None:
+
+        model_id = cr.model_identifier
+        if not self.cacheable(model_id):
+            return
+
+        key = model_id.modelkey
+        self._entries[key] = (time.monotonic() + self.ttls[model_id.data_type], cr)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, modelhash: str | int | None = None) -> None:
+
+        if modelhash is None:
+            self._entries.clear()
+            return
+
+        self._entries.pop(as_modelkey(modelhash), None)
+
+    @property
+    def hit_rate(self) -> float:
+
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+
+        return self.hits / total
@@ -1,12 +1,29 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from typing import Any, Literal
 
 import pybotters
 
+from .batch import RequestBatch
+from .breaker import CircuitBreakerRegistry
+from .cache import ResponseCache
+from .decoders import Decoder, RawBody, get_decoder
 from .fmt import Formatter
+from .hedge import Hedger
 from .models.core import HTTPRequestConponents, ModelIdentifier, RequestContents
+from .ratelimit import RateLimiter
 from .response import ClientResponse, ClientResponseProxy
+from .timing import StageTimings, parse_server_ts
+
+
+@dataclasses.dataclass
+class _Flight:
+    task: asyncio.Future
+    waiters: int = 0
 
 
 class Client(pybotters.Client):
@@ -17,12 +34,51 @@ class Client(pybotters.Client):
 
     Attributes:
         fmt (Formatter): Formatter.
+        rate_limiter (RateLimiter | None): Per-exchange request scheduler.
+            If None, requests are sent without rate limiting.
+        coalesce (bool): Whether to coalesce concurrent GET requests.
+            Concurrent fetches for the same modelhash share one HTTP request;
+            each caller gets its own copy of the response.
+            POST requests are never coalesced.
+        cache (ResponseCache | None): TTL cache for formatted responses.
+            If None, every fetch is sent over HTTP. Non-2xx responses and
+            responses that formatted to None are not cached.
+        hedger (Hedger | None): Hedged request policy for idempotent GETs.
+            If None, requests are never hedged.
+        decoder (Decoder): JSON decoder applied to the response body.
+            "json", "orjson" or a callable that takes bytes.
+        raw_body (bool): Whether to keep the body undecoded.
+            If True, raw_data is a RawBody decoded when a converter needs it.
+        breakers (CircuitBreakerRegistry | None): Circuit breakers per exchange.
+            Requests to an open circuit are not sent and yield no response, and
+            requests that exceed the breaker's call_timeout are cancelled and
+            yield no response.
     """
 
-    def __init__(self, fmt: Formatter, **kwargs):
+    def __init__(
+        self,
+        fmt: Formatter,
+        rate_limiter: RateLimiter | None = None,
+        coalesce: bool = True,
+        cache: ResponseCache | None = None,
+        hedger: Hedger | None = None,
+        decoder: Literal["json", "orjson"] | Decoder = "json",
+        raw_body: bool = False,
+        breakers: CircuitBreakerRegistry | None = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
 
         self.fmt = fmt
+        self.rate_limiter = rate_limiter
+        self.coalesce = coalesce
+        self.cache = cache
+        self.hedger = hedger
+        self.decoder = get_decoder(decoder)
+        self.raw_body = raw_body
+        self.breakers = breakers
+
+        self._inflight: dict[Hashable, _Flight] = {}
 
     async def __aenter__(self) -> Client:
         return self
@@ -30,57 +86,357 @@ class Client(pybotters.Client):
     async def __aexit__(self, *args: asyncio.Any) -> None:
         return await super().__aexit__(*args)
 
-    async def _fetch(
+    def _coalescable(self, rc: RequestContents) -> bool:
+        return self.coalesce and rc.http_request_conponents.method == "GET"
+
+    async def _single_flight(
+        self, key: Hashable, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.ensure_future(factory()))
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda _: self._release_flight(key, flight))
+
+        flight.waiters += 1
+        try:
+            # shield so that a cancelled caller does not cancel the shared request
+            return await asyncio.shield(flight.task)
+
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+
+        finally:
+            flight.waiters -= 1
+
+    def _release_flight(self, key: Hashable, flight: _Flight) -> None:
+
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+
+    async def _fetch(self, rcs: RequestContents) -> ClientResponse | None:
+
+        if not self._coalescable(rcs):
+            return await self._send(rcs)
+
+        crs = await self._single_flight(
+            ("_fetch", rcs.model_identifier.modelkey), lambda: self._send(rcs)
+        )
+
+        # callers format their response in place, so each gets its own copy
+        return None if crs is None else crs.copy()
+
+    async def _send(self, rcs: RequestContents) -> ClientResponse | None:
+
+        if self.breakers is None:
+            crs, _ = await self._send_hedged(rcs)
+            return crs
+
+        # fail fast while the circuit is open
+        breaker = self.breakers.breaker(rcs)
+        if not breaker.allow():
+            return None
+
+        # errors, cancellations and timeouts count as failures, and always
+        # release the half-open probe slot taken by allow()
+        ok = False
+        task = None
+        try:
+            # the timeout covers the venue, not the wait for a rate limit token
+            timings = await self._acquire(rcs)
+            task = asyncio.ensure_future(self._send_hedged(rcs, timings))
+
+            done, _ = await asyncio.wait({task}, timeout=breaker.call_timeout)
+            if not done:
+                # a hung venue would otherwise hold its slot until aiohttp gives up
+                breaker.timeouts += 1
+                return None
+
+            crs, ok = task.result()
+            return crs
+
+        finally:
+            if task is not None and not task.done():
+                task.cancel()
+            breaker.record(ok)
+
+    async def _send_hedged(
+        self, rcs: RequestContents, timings: StageTimings | None = None
+    ) -> tuple[ClientResponse | None, bool]:
+
+        if self.hedger is None or not self.hedger.hedgeable(rcs):
+            return await self._send_once(rcs, timings)
+
+        self.hedger.requests += 1
+
+        delay = self.hedger.delay(rcs.model_identifier.exchange_name)
+        if delay is None:
+            return await self._send_once(rcs, timings)
+
+        # the hedge timer starts once the primary has its token, so time spent
+        # waiting in the bucket never triggers a hedge
+        if timings is None:
+            timings = await self._acquire(rcs)
+        primary = asyncio.ensure_future(self._send_once(rcs, timings))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            # never queue for a token to hedge: that doubles load when throttled
+            if self.rate_limiter is not None and not self.rate_limiter.try_acquire(
+                rcs.model_identifier
+            ):
+                self.hedger.throttled += 1
+                return await primary
+
+            self.hedger.fired += 1
+            hedge = asyncio.ensure_future(
+                self._send_once(rcs, StageTimings(enqueued=time.monotonic()))
+            )
+
+            # keep the first successful response
+            pending = {primary, hedge}
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is not None or not pending:
+                    break
+
+            if winner is None:
+                winner = done.pop()
+
+            if winner is hedge:
+                self.hedger.won += 1
+
+            return winner.result()
+
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def _acquire(self, rcs: RequestContents) -> StageTimings:
+
+        timings = StageTimings(enqueued=time.monotonic())
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(rcs.model_identifier)
+
+        return timings
+
+    async def _send_once(
         self, 
-        rcs: RequestContents
-    ) -> ClientResponse | None:
+        rcs: RequestContents,
+        timings: StageTimings | None = None,
+    ) -> tuple[ClientResponse | None, bool]:
+        """Send one request. Pass `timings` if the rate limit token is already taken."""
 
         https: HTTPRequestConponents = rcs.http_request_conponents
         modelid: ModelIdentifier = rcs.model_identifier
 
-        resp = await super().fetch(
-            url=https.url,
-            method=https.method,
-            params=https.params,
-            headers=https.headers,
-            data=https.data,
-        )
+        if timings is None:
+            timings = await self._acquire(rcs)
+
+        timings.sent = time.monotonic()
+        try:
+            async with self.request(
+                url=https.url,
+                method=https.method,
+                params=https.params,
+                headers=https.headers,
+                data=https.data,
+            ) as resp:
+                timings.first_byte = time.monotonic()
+                body = await resp.read()
+
+        except asyncio.CancelledError:
+            # the loser of a hedged race: its latency is at least this long, and
+            # dropping it would bias the history towards the fast responses
+            if self.hedger is not None and self.hedger.hedgeable(rcs):
+                self.hedger.record(modelid.exchange_name, time.monotonic() - timings.sent)
+            raise
+
+        # whether the exchange is healthy, for the circuit breaker
+        ok = resp.status < 500 and resp.status != 429
+
+        raw = RawBody(body, self.decoder)
+        data = raw if self.raw_body else raw.decode()
+
+        timings.decoded = time.monotonic()
+
+        if self.hedger is not None and self.hedger.hedgeable(rcs):
+            self.hedger.record(modelid.exchange_name, timings.decoded - timings.sent)
 
         # Fetch data validation
         # https://pybotters.readthedocs.io/ja/stable/advanced.html#fetch-data-validation
         crs = None
-        if resp.data:
+        if data:
+            server_ts = None
+            if not self.raw_body:
+                server_ts = parse_server_ts(modelid.exchange_name, data)
+
             crs = ClientResponse(
                 model_identifier=modelid,
                 acq_source="HTTP",
-                raw_data=resp.data,
+                raw_data=data,
+                server_ts=server_ts,
+                timings=timings,
+                status=resp.status,
             )
 
-        return crs
+        return crs, ok
+
+    def _from_cache(self, rc: RequestContents) -> ClientResponse | None:
+
+        if self.cache is None:
+            return None
+
+        return self.cache.get(rc.model_identifier)
+
+    def _to_cache(self, crp: ClientResponseProxy) -> None:
+
+        if self.cache is None:
+            return
+
+        for cr in crp:
+            # error payloads would otherwise be served as fresh data for the whole TTL
+            if cr.status is not None and not 200 <= cr.status < 300:
+                continue
+
+            # a conversion that failed (eager only: a pending one is not run here)
+            if cr.pending_format is None and cr.formatted_data is None:
+                continue
+
+            self.cache.put(cr)
 
     async def fetch(self, rc: RequestContents) -> ClientResponseProxy:
 
+        cached = self._from_cache(rc)
+        if cached is not None:
+            return ClientResponseProxy(responses=[cached])
+
+        if not self._coalescable(rc):
+            return await self._fetch_and_format(rc)
+
+        crp = await self._single_flight(
+            ("fetch", rc.model_identifier.modelkey),
+            lambda: self._fetch_and_format(rc),
+        )
+
+        return ClientResponseProxy(responses=[cr.copy() for cr in crp])
+
+    async def _fetch_and_format(self, rc: RequestContents) -> ClientResponseProxy:
+
         crs = await self._fetch(rc)
 
         if crs is None:
             return ClientResponseProxy(responses=[])
 
-        crp = ClientResponseProxy(responses=[crs])
+        crp = self.fmt.format(ClientResponseProxy(responses=[crs]))
+        self._to_cache(crp)
 
-        return self.fmt.format(crp)
+        return crp
 
     async def paralell_fetch(
         self, 
-        *rcs: tuple[RequestContents]
+        *rcs: RequestContents | RequestBatch,
     ) -> ClientResponseProxy:
+        """paralell_fetch
+
+        Fetch requests concurrently (並列にリクエスト).
+        Pass a single RequestBatch to re-poll a fixed request set.
+
+        Returns:
+            ClientResponseProxy: Formatted responses in the order of the requests.
+
+        """
+
+        if len(rcs) == 1 and isinstance(rcs[0], RequestBatch):
+            requests = rcs[0].requests
+            order = rcs[0].launch_order
+        else:
+            requests = rcs
+            order = range(len(rcs))
+
+        responses = [self._from_cache(request) for request in requests]
+        misses = [i for i in order if responses[i] is None]
+
+        crs = await asyncio.gather(*(self._fetch(requests[i]) for i in misses))
+
+        fetched = [cr for cr in crs if cr is not None]
+        for i, cr in zip(misses, crs):
+            responses[i] = cr
+
+        # formatting works in place, so responses already holds the formatted ones
+        self._to_cache(
+            self.fmt.format(ClientResponseProxy(responses=fetched, mapping=False))
+        )
+
+        return ClientResponseProxy(responses=[r for r in responses if r is not None])
+
+    async def stream_fetch(
+        self,
+        *rcs: tuple[RequestContents],
+        concurrency: int | None = None,
+    ) -> AsyncIterator[ClientResponseProxy]:
+        """stream_fetch
+
+        Fetch requests and yield each formatted response as soon as it arrives
+        (到着順にレスポンスを返す).
+
+        Args:
+            *rcs (RequestContents): Requests to fetch.
+            concurrency (int | None): Maximum number of requests in flight.
+                If None, all requests are sent at once.
+
+        Yields:
+            ClientResponseProxy: Formatted proxy containing a single response.
+
+        """
+
+        sem = asyncio.Semaphore(concurrency) if concurrency else None
+
+        async def _bounded_fetch(rc: RequestContents) -> ClientResponse | None:
+
+            if sem is None:
+                return await self._fetch(rc)
+
+            async with sem:
+                return await self._fetch(rc)
+
+        hits = []
+        misses = []
+        for rc in rcs:
+            cached = self._from_cache(rc)
+            if cached is None:
+                misses.append(rc)
+            else:
+                hits.append(cached)
+
+        # send the misses first, so that a slow consumer of the hits does not delay them
+        tasks = [asyncio.ensure_future(_bounded_fetch(rc)) for rc in misses]
+
+        try:
+            for cached in hits:
+                yield ClientResponseProxy(responses=[cached])
 
-        tasks = []
-        for request in rcs:
-            tasks.append(self._fetch(request))
+            for next_done in asyncio.as_completed(tasks):
+                crs = await next_done
+                if crs is None:
+                    continue
 
-        crs = await asyncio.gather(*tasks)
-        crs = [r for r in crs if r]
+                crp = self.fmt.format(ClientResponseProxy(responses=[crs]))
+                self._to_cache(crp)
 
-        crp = ClientResponseProxy(responses=crs)
+                yield crp
 
-        return self.fmt.format(crp)
+        finally:
+            for task in tasks:
+                task.cancel()
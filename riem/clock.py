@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import time
+
+# UNIX time at monotonic zero, taken once at import
+_EPOCH_OFFSET = time.time() - time.monotonic()
+
+
+def now() -> float:
+    """now
+
+    UNIX timestamp derived from the monotonic clock (単調時計ベースのUNIX時刻).
+    Cheaper than `datetime.datetime.now().timestamp()` and never goes backwards,
+    at the cost of not following wall-clock adjustments after import.
+
+    Returns:
+        float: UNIX timestamp in seconds.
+
+    """
+
+    return _EPOCH_OFFSET + time.monotonic()
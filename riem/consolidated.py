@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import operator
+from typing import Any
+
+import numpy as np
+
+from .formats.molds.orderbook import Book, Orderbook
+from .response import ClientResponse, ClientResponseProxy
+
+# (price, size, venue)
+Level = tuple[float, float, str]
+
+_price = operator.itemgetter(0)
+
+
+def _symbol(cr: ClientResponse) -> Any:
+    return cr.model_identifier.arguments.get("symbol")
+
+
+def _levels(book: Book, rate: float, venue: str) -> list[Level]:
+
+    prices = book.price_array if rate == 1 else book.price_array / rate
+    return list(zip(prices.tolist(), book.size_array.tolist(), itertools.repeat(venue)))
+
+
+class ConsolidatedOrderbook:
+    """ConsolidatedOrderbook
+
+    Orderbook of one pair merged across venues (複数取引所の統合板).
+    Levels keep the venue they came from. Prices are divided by the FX rate
+    of their venue, like Orderbook.convert_to. A venue is only converted again
+    when its book or rate changes, and updating one venue only re-merges that
+    venue's levels into the others.
+
+    Attributes:
+        depth (int | None): Number of merged levels per side to return.
+            If None, every level is returned.
+        rates (dict[str, float]): FX rate per venue (exchange_name).
+            Venues without a rate are not converted.
+        symbols (dict[str, str] | None): Symbol of the pair per venue, used by
+            update_from to pick the orderbooks of this pair. Venues not in it are
+            skipped. If None, each venue must have orderbooks of a single symbol.
+        books (dict[str, Orderbook]): Latest unconverted book per venue.
+
+    """
+
+    def __init__(
+        self,
+        depth: int | None = None,
+        rates: dict[str, float] | None = None,
+        symbols: dict[str, str] | None = None,
+    ) -> None:
+
+        self.depth = depth
+        self.rates: dict[str, float] = dict(rates or {})
+        self.symbols = dict(symbols) if symbols is not None else None
+        self.books: dict[str, Orderbook] = {}
+
+        # converted (asks, bids) per venue and the rate they were converted with
+        self._converted: dict[str, tuple[list[Level], list[Level]]] = {}
+        self._applied_rates: dict[str, float] = {}
+
+        self._merged_asks: list[Level] = []
+        self._merged_bids: list[Level] = []
+
+        self._sources: dict[str, ClientResponse] = {}
+
+    @classmethod
+    def from_proxy(
+        cls,
+        crp: ClientResponseProxy,
+        depth: int | None = None,
+        rates: dict[str, float] | None = None,
+        symbols: dict[str, str] | None = None,
+    ) -> ConsolidatedOrderbook:
+
+        cob = cls(depth=depth, rates=rates, symbols=symbols)
+        cob.update_from(crp)
+
+        return cob
+
+    def __contains__(self, venue: str) -> bool:
+        return venue in self.books
+
+    @property
+    def venues(self) -> list[str]:
+        return list(self.books)
+
+    def _convert(self, venue: str, orderbook: Orderbook) -> bool:
+
+        rate = self.rates.get(venue, 1)
+        if self.books.get(venue) is orderbook and self._applied_rates[venue] == rate:
+            return False
+
+        self.books[venue] = orderbook
+        self._applied_rates[venue] = rate
+        self._converted[venue] = (
+            _levels(orderbook.asks, rate, venue),
+            _levels(orderbook.bids, rate, venue),
+        )
+
+        return True
+
+    def _rebuild(self) -> None:
+
+        # k-way merge of every venue's cached levels
+        converted = self._converted.values()
+        self._merged_asks = list(heapq.merge(*(a for a, _ in converted), key=_price))
+        self._merged_bids = list(
+            heapq.merge(*(b for _, b in converted), key=_price, reverse=True)
+        )
+
+    def update(self, venue: str, orderbook: Orderbook) -> None:
+        """Replace the book of one venue and re-merge only its levels."""
+
+        known = venue in self.books
+        if not self._convert(venue, orderbook):
+            return
+
+        self._merge_venue(venue, known)
+
+    def _merge_venue(self, venue: str, known: bool) -> None:
+
+        # the other venues stay merged; only this venue's levels are merged back in
+        asks, bids = self._converted[venue]
+        if known:
+            self._merged_asks = [lv for lv in self._merged_asks if lv[2] != venue]
+            self._merged_bids = [lv for lv in self._merged_bids if lv[2] != venue]
+
+        self._merged_asks = list(heapq.merge(self._merged_asks, asks, key=_price))
+        self._merged_bids = list(
+            heapq.merge(self._merged_bids, bids, key=_price, reverse=True)
+        )
+
+    def _latest_orderbooks(self, crp: ClientResponseProxy) -> dict[str, ClientResponse]:
+
+        # the time indexes only exist on a mapped proxy (e.g. not after sort_by_ts)
+        responses = crp.latest_per_key() if crp.mapping else crp.responses
+
+        latest: dict[str, ClientResponse] = {}
+        for cr in responses:
+            mi = cr.model_identifier
+            if mi.data_type != "orderbooks":
+                continue
+
+            venue = mi.exchange_name
+            if self.symbols is not None and self.symbols.get(venue) != _symbol(cr):
+                continue
+
+            last = latest.get(venue)
+            seen = last or self._sources.get(venue)
+            if self.symbols is None and seen is not None and _symbol(seen) != _symbol(cr):
+                raise ValueError(
+                    f"orderbooks of several symbols for {venue}, pass symbols to pick one"
+                )
+
+            if last is None or cr.ts >= last.ts:
+                latest[venue] = cr
+
+        return latest
+
+    def update_from(self, crp: ClientResponseProxy) -> None:
+        """update_from
+
+        Update the venues whose latest orderbook response in `crp` changed
+        (レスポンスから更新). Venues whose latest response is unchanged are skipped.
+        A single changed venue is re-merged incrementally, several are k-way merged.
+
+        Raises:
+            ValueError: If `symbols` is None and a venue has orderbooks of several
+                symbols, in `crp` or compared with earlier updates.
+
+        """
+
+        changed: list[tuple[str, bool]] = []
+        for venue, cr in self._latest_orderbooks(crp).items():
+            last = self._sources.get(venue)
+            if last is cr or (last is not None and last.ts > cr.ts):
+                continue
+
+            orderbook = cr.formatted_data
+            if orderbook is None:
+                continue
+
+            known = venue in self.books
+            self._sources[venue] = cr
+            if self._convert(venue, orderbook):
+                changed.append((venue, known))
+
+        if len(changed) > 1:
+            self._rebuild()
+        elif changed:
+            venue, known = changed[0]
+            self._merge_venue(venue, known)
+
+    def remove(self, venue: str) -> None:
+
+        if venue not in self.books:
+            return
+
+        del self.books[venue], self._applied_rates[venue], self._converted[venue]
+        self._sources.pop(venue, None)
+
+        self._merged_asks = [lv for lv in self._merged_asks if lv[2] != venue]
+        self._merged_bids = [lv for lv in self._merged_bids if lv[2] != venue]
+
+    def set_rate(self, venue: str, rate: float) -> None:
+        """Change the FX rate of a venue. Only that venue is converted again."""
+
+        self.rates[venue] = rate
+        if venue in self.books:
+            self.update(venue, self.books[venue])
+
+    def _head(self, merged: list[Level]) -> list[Level]:
+        return merged if self.depth is None else merged[: self.depth]
+
+    @property
+    def asks(self) -> list[Level]:
+        """Merged asks as (price, size, venue), ascending."""
+
+        return self._head(self._merged_asks)
+
+    @property
+    def bids(self) -> list[Level]:
+        """Merged bids as (price, size, venue), descending."""
+
+        return self._head(self._merged_bids)
+
+    @property
+    def best_ask(self) -> Level | None:
+
+        asks = self.asks
+        return asks[0] if asks else None
+
+    @property
+    def best_bid(self) -> Level | None:
+
+        bids = self.bids
+        return bids[0] if bids else None
+
+    def to_orderbook(self) -> Orderbook:
+        """Merged levels as an Orderbook, without the venue tags."""
+
+        def _book(levels: list[Level]) -> Book:
+
+            if not levels:
+                return Book.from_arrays(np.empty(0), np.empty(0))
+
+            prices, sizes, _ = zip(*levels)
+            return Book.from_arrays(np.array(prices), np.array(sizes))
+
+        return Orderbook(asks=_book(self.asks), bids=_book(self.bids))
@@ -1,9 +1,55 @@
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, inspect, select, text, update
 from sqlalchemy.orm import sessionmaker
 
+from ..models.core import as_modelkey
 from .base import Base
 
 
+def migrate_modelkey(engine) -> None:
+    """migrate_modelkey
+
+    Add the modelkey column to tables created before it existed and backfill it
+    from the hex modelhash (modelkey列の追加と補完).
+    `Base.metadata.create_all` never alters existing tables, so this runs after it.
+
+    """
+
+    existing = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+
+    for table in Base.metadata.sorted_tables:
+        if "modelkey" not in table.c or not existing.has_table(table.name):
+            continue
+
+        column_names = {c["name"] for c in existing.get_columns(table.name)}
+        with engine.begin() as conn:
+            if "modelkey" not in column_names:
+                conn.execute(
+                    text(
+                        "ALTER TABLE {} ADD COLUMN modelkey {}".format(
+                            preparer.quote(table.name),
+                            table.c.modelkey.type.compile(dialect=engine.dialect),
+                        )
+                    )
+                )
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+            legacy = conn.execute(
+                select(table.c.id, table.c.modelhash).where(
+                    table.c.modelkey.is_(None), table.c.modelhash.is_not(None)
+                )
+            ).all()
+            if legacy:
+                conn.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("row_id"))
+                    .values(modelkey=bindparam("key")),
+                    [{"row_id": i, "key": as_modelkey(h)} for i, h in legacy],
+                )
+
+
 class BaseEngine:
     def __init__(self, url) -> None:
 
@@ -23,5 +69,6 @@ class Database:
 
         self.engine = BaseEngine(url).engine
         Base.metadata.create_all(self.engine)
+        migrate_modelkey(self.engine)
 
         self.session = BaseSession(url).session
@@ -6,7 +6,7 @@ from typing import Any
 from sqlalchemy.orm import relationship
 from sqlalchemy.schema import Column
 from sqlalchemy.sql.schema import ForeignKey
-from sqlalchemy.types import DateTime, Integer, String
+from sqlalchemy.types import BigInteger, DateTime, Integer, String
 
 from .base import Base
 
@@ -20,15 +20,16 @@ class OrderbookTable(Base):
     id = Column(Integer, primary_key=True)
     created_on = Column(DateTime(), default=datetime.now)
 
-    modelhash = Column(String)
+    modelhash = Column(String)  # legacy rows only, new rows use modelkey
+    modelkey = Column(BigInteger, index=True)
     exchange_name = Column(String)
     symbol = Column(String)
     asks = relationship("AskTable", backref="orderbook")
     bids = relationship("BidTable", backref="orderbook")
 
     def __repr__(self) -> str:
-        attrs = "modelhash={}, exchange_name={}, symbol={}, ask={}, bid={}".format(
-            self.modelhash, self.exchange_name, self.symbol, self.asks, self.bids
+        attrs = "modelkey={}, exchange_name={}, symbol={}, ask={}, bid={}".format(
+            self.modelkey, self.exchange_name, self.symbol, self.asks, self.bids
         )
 
         return "OrderbookTable({})".format(attrs)
@@ -74,13 +75,14 @@ class AssetTable(Base):
     id = Column(Integer, primary_key=True)
     created_on = Column(DateTime(), default=datetime.now)
 
-    modelhash = Column(String)
+    modelhash = Column(String)  # legacy rows only, new rows use modelkey
+    modelkey = Column(BigInteger, index=True)
     exchange_name = Column(String)
     asset = relationship("AssetDetailTable", backref="asset")
 
     def __repr__(self) -> str:
-        attrs = "modelhash={}, exchange_name={}, asset={}".format(
-            self.modelhash, self.exchange_name, self.asset
+        attrs = "modelkey={}, exchange_name={}, asset={}".format(
+            self.modelkey, self.exchange_name, self.asset
         )
 
         return "AssetTable({})".format(attrs)
@@ -116,13 +118,14 @@ class OrderTable(Base):
     id = Column(Integer, primary_key=True)
     created_on = Column(DateTime(), default=datetime.now)
 
-    modelhash = Column(String)
+    modelhash = Column(String)  # legacy rows only, new rows use modelkey
+    modelkey = Column(BigInteger, index=True)
     exchange_name = Column(String)
     order_id = Column(String)
 
     def __repr__(self) -> str:
-        attrs = "modelhash={}, exchange_name={}, order_id={}".format(
-            self.modelhash, self.exchange_name, self.order_id
+        attrs = "modelkey={}, exchange_name={}, order_id={}".format(
+            self.modelkey, self.exchange_name, self.order_id
         )
 
         return "OrderTable({})".format(attrs)
@@ -141,13 +144,14 @@ class TickerTable(Base):
     id = Column(Integer, primary_key=True)
     created_on = Column(DateTime(), default=datetime.now)
 
-    modelhash = Column(String)
+    modelhash = Column(String)  # legacy rows only, new rows use modelkey
+    modelkey = Column(BigInteger, index=True)
     exchange_name = Column(String)
     ticker = relationship("TickerDetailTable", backref="ticker")
 
     def __repr__(self) -> str:
-        attrs = "modelhash={}, exchange_name={}, ticker={}".format(
-            self.modelhash, self.exchange_name, self.ticker
+        attrs = "modelkey={}, exchange_name={}, ticker={}".format(
+            self.modelkey, self.exchange_name, self.ticker
         )
 
         return "TickerTable({})".format(attrs)
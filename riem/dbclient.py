@@ -1,3 +1,4 @@
+import time
 from typing import Any, Callable
 
 from .database.database import Database
@@ -29,7 +30,7 @@ def create_orderbooks(r: ClientResponse):
     bids = [BidTable(price=p, size=s) for p, s in fd.bids.book]
 
     return OrderbookTable(
-        modelhash=model_id.modelhash,
+        modelkey=model_id.modelkey,
         exchange_name=model_id.exchange_name,
         symbol=model_id.arguments["symbol"],
         asks=asks,
@@ -45,7 +46,7 @@ def create_assets(r: ClientResponse):
     details = [AssetDetailTable(name=k, amount=v) for k, v in fd.asset_detail.items()]
 
     return AssetTable(
-        modelhash=model_id.modelhash,
+        modelkey=model_id.modelkey,
         exchange_name=model_id.exchange_name,
         asset=details,
     )
@@ -57,7 +58,7 @@ def create_orders(r: ClientResponse):
     fd: Order = r.formatted_data
 
     return OrderTable(
-        modelhash=model_id.modelhash,
+        modelkey=model_id.modelkey,
         exchange_name=model_id.exchange_name,
         order_id=fd.order_id,
     )
@@ -74,7 +75,7 @@ def create_ticker(r: ClientResponse):
     ]
 
     return TickerTable(
-        modelhash=model_id.modelhash,
+        modelkey=model_id.modelkey,
         exchange_name=model_id.exchange_name,
         ticker=details,
     )
@@ -121,6 +122,11 @@ class DatabaseClient:
             session.add_all(records)
             session.commit()
 
+        persisted = time.monotonic()
+        for r in crp:
+            if r.timings is not None:
+                r.timings.persisted = persisted
+
     def insert(self, table_objs: list[Any]) -> None:
 
         with self.database.session as session:
@@ -145,26 +151,22 @@ class DatabaseClient:
 
                 # struct query
                 query = session.query(table)
-                query = query.filter(table.modelhash == model_id.modelhash)
+                # legacy rows are backfilled by migrate_modelkey when the Database is created
+                query = query.filter(table.modelkey == model_id.modelkey)
                 if is_desc:
                     query = query.order_by(self.tables[data_type].id.desc())
                 results = query.limit(limit)
 
                 # create response
                 for res in results:
-                    crp += ClientResponseProxy(
-                        responses=[
-                            ClientResponse(
-                                model_identifier=model_id,
-                                acq_source="DB",
-                                raw_data=res.for_fmt,
-                            )
-                        ],
-                        mapping=False,
+                    crp.append(
+                        ClientResponse(
+                            model_identifier=model_id,
+                            acq_source="DB",
+                            raw_data=res.for_fmt,
+                        )
                     )
 
-        crp.remap_hash_idxs()
-
         crp = self.fmt.format(crp)
 
         return crp
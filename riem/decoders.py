@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Literal
+
+Decoder = Callable[[bytes], Any]
+
+
+def get_decoder(decoder: Literal["json", "orjson"] | Decoder = "json") -> Decoder:
+    """get_decoder
+
+    Resolve a JSON decoder (JSONデコーダを取得).
+
+    Args:
+        decoder (Literal["json", "orjson"] | Decoder): Name of a built-in decoder
+            or a callable that takes the response body as bytes.
+
+    Returns:
+        Decoder: Callable that decodes bytes.
+
+    """
+
+    if callable(decoder):
+        return decoder
+
+    if decoder == "json":
+        return json.loads
+
+    if decoder == "orjson":
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "orjson is not installed. Install it with `pip install riem[orjson]`."
+            ) from e
+
+        return orjson.loads
+
+    raise ValueError(f"unknown decoder: {decoder}")
+
+
+class RawBody:
+    """RawBody
+
+    Undecoded response body (未デコードのレスポンスボディ).
+    The body is decoded on the first call of decode() and memoized.
+
+    Attributes:
+        body (bytes): Response body.
+        decoder (Decoder): Decoder used by decode().
+
+    """
+
+    __slots__ = ("body", "decoder", "_data", "_decoded")
+
+    def __init__(self, body: bytes, decoder: Decoder) -> None:
+
+        self.body = body
+        self.decoder = decoder
+
+        self._data: Any = None
+        self._decoded = False
+
+    def __bool__(self) -> bool:
+        return bool(self.body)
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def __repr__(self) -> str:
+        return f"RawBody({len(self.body)} bytes, decoded={self._decoded})"
+
+    def decode(self) -> Any:
+        """Decoded body, or None if the body is not JSON."""
+
+        if not self._decoded:
+            try:
+                self._data = self.decoder(self.body)
+            except ValueError:
+                self._data = None
+
+            self._decoded = True
+
+        return self._data
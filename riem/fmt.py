@@ -1,46 +1,92 @@
+import time
+from typing import Any
+
+from .decoders import RawBody
 from .formats.converter import Converter
 from .response import ClientResponse, ClientResponseProxy
+from .timing import parse_server_ts
 
 
 class Formatter:
+    """Formatter
+
+    Converts raw data into formatted data with the registered converters
+    (レスポンスの整形).
+
+    Attributes:
+        conv_map (dict[str, Converter]): Converter per data_type.
+        lazy (bool): Whether to defer conversion until formatted_data is read.
+            Responses nobody reads are never converted.
 
-    def __init__(self, *converters: Converter) -> None:
+    """
+
+    def __init__(self, *converters: Converter, lazy: bool = False) -> None:
 
         self.conv_map: dict[str, Converter] = {
             converter.data_type: converter for converter in converters
         }
+        self.lazy = lazy
+
+    def convert(self, cr: ClientResponse) -> Any:
+        """convert
+
+        Convert the raw data of a response (レスポンスを変換).
+        Also sets server_ts if the raw data was an undecoded RawBody.
+
+        Returns:
+            Any: Formatted data, or None if no converter is registered.
+
+        """
+
+        model_id = cr.model_identifier
+        if model_id.data_type not in self.conv_map:
+            return None
+
+        en = model_id.exchange_name
+        # DB and WS responses are stored in the database format
+        if cr.acq_source in ("DB", "WS"):
+            en = "db"
+
+        raw_data = cr.raw_data
+        if isinstance(raw_data, RawBody):
+            raw_data = raw_data.decode()
+            cr.server_ts = parse_server_ts(en, raw_data)
+
+        if raw_data is None:
+            return None
+
+        converter = self.conv_map[model_id.data_type]
+        if converter.uses_model_identifier:
+            return converter.handle(
+                exchange_name=en,
+                raw_data=raw_data,
+                model_identifier=model_id,
+            )
+
+        return converter.handle(
+            exchange_name=en,
+            raw_data=raw_data,
+        )
+
+    def _convert_and_stamp(self, cr: ClientResponse) -> Any:
+
+        fd = self.convert(cr)
+        if cr.timings is not None:
+            cr.timings.formatted = time.monotonic()
+
+        return fd
 
     def format(self, responses: ClientResponseProxy) -> ClientResponseProxy:
 
-        crp = ClientResponseProxy(responses=[], mapping=False)
+        crp = ClientResponseProxy(responses=[])
         for cr in responses:
 
-            model_id = cr.model_identifier
-
-            fd = None
-            if model_id.data_type in self.conv_map:
-
-                en = model_id.exchange_name
-                if cr.acq_source == "DB":
-                    en = "db"
-
-                fd = self.conv_map[model_id.data_type].handle(
-                    exchange_name=en,
-                    raw_data=cr.raw_data,
-                )
-
-            crp += ClientResponseProxy(
-                responses=[
-                    ClientResponse(
-                        model_identifier=model_id,
-                        acq_source=cr.acq_source,
-                        raw_data=cr.raw_data,
-                        formatted_data=fd,
-                    )
-                ],
-                mapping=False,
-            )
+            # fill in place instead of copying the response
+            if self.lazy:
+                cr.pending_format = self._convert_and_stamp
+            else:
+                cr.formatted_data = self._convert_and_stamp(cr)
 
-        crp.remap_hash_idxs()
+            crp.append(cr)
 
         return crp
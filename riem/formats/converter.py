@@ -4,6 +4,9 @@ from typing import Any
 
 class Converter(metaclass=ABCMeta):
 
+    # If True, Formatter also passes `model_identifier=` to handle().
+    uses_model_identifier: bool = False
+
     @abstractmethod
     def handle(self, exchange_name: str, raw_data: Any):
         pass
@@ -1,64 +1,469 @@
 from __future__ import annotations
 
 import dataclasses
+import itertools
+from typing import Sequence
+
+import numpy as np
+
+from ..ticks import TickSize
 
 
-@dataclasses.dataclass
 class Book:
-    book: list[tuple[str, str]]  # prices, sizes
+    """Book
+
+    One side of an orderbook (板の片側).
+    Holds (price, size) tuples, float64 arrays or integer ticks and lots,
+    and derives the other forms on first use. Prices and sizes are parsed
+    at most once, and the lookup maps are only built if asked for.
+
+    Attributes:
+        book (list[tuple[str, str]]): Levels as (price, size).
+        price_array (np.ndarray): Prices, contiguous float64.
+        size_array (np.ndarray): Sizes, contiguous float64.
+        tick_size (TickSize | None): Tick and lot size, if the book is in ticks.
+        tick_array (np.ndarray): Prices in ticks, int64. Requires tick_size.
+        lot_array (np.ndarray): Sizes in lots, int64. Requires tick_size.
+
+        best_price (str): Price of the first level.
+        price_map (dict[str, str]): Price -> size.
+        size_map (dict[str, str]): Size -> price.
+        cum_sizes (np.ndarray): Cumulative size from the best level.
+        cum_notional (np.ndarray): Cumulative price * size from the best level.
+
+    """
+
+    __slots__ = (
+        "tick_size",
+        "_book",
+        "_prices",
+        "_sizes",
+        "_ticks",
+        "_lots",
+        "_price_map",
+        "_size_map",
+        "_cum_sizes",
+        "_cum_notional",
+    )
+
+    def __init__(self, book: list[tuple[str, str]]) -> None:
+
+        self.tick_size: TickSize | None = None
+        self._book: list[tuple[str, str]] | None = book
+        self._prices: np.ndarray | None = None
+        self._sizes: np.ndarray | None = None
+        self._ticks: np.ndarray | None = None
+        self._lots: np.ndarray | None = None
+        self._price_map: dict[str, str] | None = None
+        self._size_map: dict[str, str] | None = None
+        self._cum_sizes: np.ndarray | None = None
+        self._cum_notional: np.ndarray | None = None
+
+    @classmethod
+    def from_arrays(cls, prices: np.ndarray, sizes: np.ndarray) -> Book:
+
+        book = cls.__new__(cls)
+        book.tick_size = None
+        book._book = None
+        book._prices = np.ascontiguousarray(prices, dtype=np.float64)
+        book._sizes = np.ascontiguousarray(sizes, dtype=np.float64)
+        book._ticks = book._lots = None
+        book._price_map = book._size_map = None
+        book._cum_sizes = book._cum_notional = None
+
+        return book
+
+    @classmethod
+    def from_ticks(cls, ticks: np.ndarray, lots: np.ndarray, tick_size: TickSize) -> Book:
+
+        book = cls.__new__(cls)
+        book.tick_size = tick_size
+        book._book = None
+        book._prices = book._sizes = None
+        book._ticks = np.ascontiguousarray(ticks, dtype=np.int64)
+        book._lots = np.ascontiguousarray(lots, dtype=np.int64)
+        book._price_map = book._size_map = None
+        book._cum_sizes = book._cum_notional = None
+
+        return book
+
+    def with_ticks(self, tick_size: TickSize) -> Book:
+        """Same levels as integer ticks and lots of `tick_size`. Raises ValueError if a level is off the grid."""
+
+        return Book.from_ticks(
+            tick_size.to_ticks(self.price_array),
+            tick_size.to_lots(self.size_array),
+            tick_size,
+        )
+
+    def _parse(self) -> None:
+
+        if self._ticks is not None:
+            self._prices = self.tick_size.from_ticks(self._ticks)
+            self._sizes = self.tick_size.from_lots(self._lots)
+            return
+
+        book = self._book
+        flat = np.fromiter(
+            map(float, itertools.chain.from_iterable(book)), np.float64, 2 * len(book)
+        )
+        self._prices = flat[0::2].copy()
+        self._sizes = flat[1::2].copy()
+
+    @property
+    def price_array(self) -> np.ndarray:
+
+        if self._prices is None:
+            self._parse()
+
+        return self._prices
+
+    @property
+    def size_array(self) -> np.ndarray:
+
+        if self._sizes is None:
+            self._parse()
+
+        return self._sizes
+
+    @property
+    def tick_array(self) -> np.ndarray:
+
+        if self._ticks is None:
+            raise ValueError("the book has no tick size. Use with_ticks() first.")
+
+        return self._ticks
+
+    @property
+    def lot_array(self) -> np.ndarray:
+
+        if self._lots is None:
+            raise ValueError("the book has no tick size. Use with_ticks() first.")
+
+        return self._lots
+
+    def __repr__(self) -> str:
+        return f"Book(book={self.book!r})"
 
-    def __post_init__(self) -> None:
-        self.best_price = self.book[0][0]
-        self.price_map = {p: s for p, s in self.book}
-        self.size_map = {s: p for p, s in self.book}
+    def __eq__(self, other: object) -> bool:
+
+        if not isinstance(other, Book):
+            return NotImplemented
+
+        if self._ticks is not None and other._ticks is not None:
+            if self.tick_size == other.tick_size:
+                return np.array_equal(self._ticks, other._ticks) and np.array_equal(
+                    self._lots, other._lots
+                )
+
+        return np.array_equal(self.price_array, other.price_array) and np.array_equal(
+            self.size_array, other.size_array
+        )
+
+    __hash__ = None
 
     def __len__(self) -> int:
-        return len(self.book)
 
-    def __getitem__(self, idx: int) -> Book:
+        if self._book is not None:
+            return len(self._book)
+
+        if self._ticks is not None:
+            return len(self._ticks)
+
+        return len(self._prices)
+
+    def __getitem__(self, idx: int) -> tuple[str, str]:
         return self.book[idx]
 
     def __iter__(self):
         return iter(self.book)
 
+    @property
+    def book(self) -> list[tuple[str, str]]:
+
+        if self._book is None:
+            self._book = [
+                (str(p), str(s))
+                for p, s in zip(self.price_array.tolist(), self.size_array.tolist())
+            ]
+
+        return self._book
+
+    @property
+    def best_price(self) -> str:
+        return self.book[0][0]
+
+    @property
+    def price_map(self) -> dict[str, str]:
+
+        if self._price_map is None:
+            self._price_map = {p: s for p, s in self.book}
+
+        return self._price_map
+
+    @property
+    def size_map(self) -> dict[str, str]:
+
+        if self._size_map is None:
+            self._size_map = {s: p for p, s in self.book}
+
+        return self._size_map
+
     def convert_to(self, given_rate: float):
 
-        return Book(book=[(str(float(p) / given_rate), s) for p, s in self.book])
+        return Book.from_arrays(self.price_array / given_rate, self.size_array)
+
+    def _descending(self) -> bool:
+        prices = self.price_array
+        return len(prices) > 1 and prices[0] > prices[-1]
+
+    def _diff_keys(self, before: Book) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+
+        if (
+            self.tick_size is not None
+            and self.tick_size == before.tick_size
+            and self._ticks is not None
+            and before._ticks is not None
+        ):
+            return self._ticks, self._lots, before._ticks, before._lots
 
-    def calc_absdiff(self, before: Book):
+        return self.price_array, self.size_array, before.price_array, before.size_array
 
-        p_union: set[str] = set(self.prices) | set(before.prices)
+    def calc_absdiff(self, before: Book, descending: bool | None = None) -> Book:
+        """calc_absdiff
 
-        book = []
-        for p in p_union:
+        Size change per price level since `before` (板の差分).
+        Both books must be sorted in the same direction. The levels are
+        merged in O(depth), compared by value (by tick if both books are
+        in the same ticks), and returned sorted in that direction.
 
-            s_before = 0.0
-            if p in before.price_map.keys():
-                s_before = before.price_map[p]
+        Args:
+            before (Book): Previous book.
+            descending (bool | None): Whether the books are sorted by descending
+                price (bids). If None, it is inferred from the levels.
 
-            s_after = 0.0
-            if p in self.price_map.keys():
-                s_after = self.price_map[p]
+        """
 
-            book.append((p, s_after - s_before))
+        if descending is None:
+            descending = self._descending() or before._descending()
+        keys_a, sizes_a, keys_b, sizes_b = self._diff_keys(before)
+        if descending:
+            keys_a, sizes_a = keys_a[::-1], sizes_a[::-1]
+            keys_b, sizes_b = keys_b[::-1], sizes_b[::-1]
 
-        return Book(book=book)
+        keys = np.concatenate((keys_a, keys_b))
+        sizes = np.concatenate((sizes_a, -sizes_b))
+
+        # both halves are sorted, so the stable sort (timsort) is a linear merge
+        order = np.argsort(keys, kind="stable")
+        keys, sizes = keys[order], sizes[order]
+
+        new_level = np.empty(len(keys), dtype=bool)
+        new_level[:1] = True
+        new_level[1:] = keys[1:] != keys[:-1]
+
+        starts = np.flatnonzero(new_level)
+        keys = keys[starts]
+        sizes = np.add.reduceat(sizes, starts) if len(starts) else sizes
+
+        if descending:
+            keys, sizes = keys[::-1], sizes[::-1]
+
+        if keys.dtype == np.int64:
+            return Book.from_ticks(keys, sizes, self.tick_size)
+
+        return Book.from_arrays(keys, sizes)
+
+    @staticmethod
+    def calc_absdiff_series(
+        books: Sequence[Book], descending: bool | None = None
+    ) -> list[Book]:
+        """calc_absdiff_series
+
+        calc_absdiff of every consecutive pair of a book series, in one pass over
+        arrays (連続する板の差分を一括計算). Books may have different depths.
+        `descending` is inferred from the whole series if None.
+
+        Returns:
+            list[Book]: len(books) - 1 diffs, `books[i + 1]` against `books[i]`.
+
+        """
+
+        if len(books) < 2:
+            return []
+
+        tick_size = books[0].tick_size
+        in_ticks = tick_size is not None and all(
+            b._ticks is not None and b.tick_size == tick_size for b in books
+        )
+        if descending is None:
+            descending = any(b._descending() for b in books)
+
+        n, depth = len(books), max(len(b) for b in books)
+        keys = np.full((n, depth), np.nan)
+        sizes = np.zeros((n, depth))
+        for i, b in enumerate(books):
+            k = len(b)
+            keys[i, :k] = b._ticks if in_ticks else b.price_array
+            sizes[i, :k] = b._lots if in_ticks else b.size_array
+
+        # sort descending sides ascending; NaN padding sorts last either way
+        if descending:
+            keys = -keys
+
+        pair_keys = np.concatenate((keys[1:], keys[:-1]), axis=1)
+        pair_sizes = np.concatenate((sizes[1:], -sizes[:-1]), axis=1)
+
+        order = np.argsort(pair_keys, axis=1, kind="stable")
+        pair_keys = np.take_along_axis(pair_keys, order, axis=1)
+        pair_sizes = np.take_along_axis(pair_sizes, order, axis=1)
+
+        # NaN != NaN, so every padding cell opens its own group and is dropped below
+        new_level = np.ones(pair_keys.shape, dtype=bool)
+        new_level[:, 1:] = pair_keys[:, 1:] != pair_keys[:, :-1]
+
+        starts = np.flatnonzero(new_level.ravel())
+        level_keys = pair_keys.ravel()[starts]
+        level_sizes = np.add.reduceat(pair_sizes.ravel(), starts) if len(starts) else pair_sizes.ravel()
+        rows = starts // pair_keys.shape[1]
+
+        valid = ~np.isnan(level_keys)
+        level_keys, level_sizes, rows = level_keys[valid], level_sizes[valid], rows[valid]
+        if descending:
+            level_keys = -level_keys
+
+        if in_ticks:
+            level_keys = level_keys.astype(np.int64)
+            level_sizes = level_sizes.astype(np.int64)
+
+        bounds = np.searchsorted(rows, np.arange(n)).tolist()
+        diffs = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if in_ticks:
+                diffs.append(Book.from_ticks(level_keys[lo:hi], level_sizes[lo:hi], tick_size))
+            else:
+                diffs.append(Book.from_arrays(level_keys[lo:hi], level_sizes[lo:hi]))
+
+        return diffs
+
+    @property
+    def cum_sizes(self) -> np.ndarray:
+
+        if self._cum_sizes is None:
+            self._cum_sizes = np.cumsum(self.size_array)
+
+        return self._cum_sizes
+
+    @property
+    def cum_notional(self) -> np.ndarray:
+
+        if self._cum_notional is None:
+            self._cum_notional = np.cumsum(self.price_array * self.size_array)
+
+        return self._cum_notional
+
+    def avg_price_for(self, amounts: np.ndarray | Sequence[float]) -> np.ndarray:
+        """avg_price_for
+
+        Average fill price of taking each amount from this side (約定平均価格).
+        The last level is filled only partially, for exactly what is left.
+
+        Args:
+            amounts (np.ndarray | Sequence[float]): Amounts to take.
+
+        Returns:
+            np.ndarray: Average price per amount, NaN where the book is too thin
+                or the amount is not positive.
+
+        """
+
+        amounts = np.asarray(amounts, dtype=np.float64)
+        cum_sizes, cum_notional = self.cum_sizes, self.cum_notional
+        if len(cum_sizes) == 0:
+            return np.full(amounts.shape, np.nan)
+
+        # first level where the cumulative size reaches the amount
+        idx = np.searchsorted(cum_sizes, amounts, side="left")
+        level = np.minimum(idx, len(cum_sizes) - 1)
+        prev = level - 1
+
+        filled_sizes = np.where(prev >= 0, cum_sizes[prev], 0.0)
+        filled_notional = np.where(prev >= 0, cum_notional[prev], 0.0)
+        notional = filled_notional + (amounts - filled_sizes) * self.price_array[level]
+
+        fillable = (idx < len(cum_sizes)) & (amounts > 0)
+        return np.divide(notional, amounts, out=np.full(notional.shape, np.nan), where=fillable)
 
     def calc_avg_acq_price(self, amount: float) -> float:
+        """calc_avg_acq_price
+
+        Average fill price of taking `amount` from this side (約定平均価格).
+        If the book is thinner than `amount`, the average of the whole book.
+
+        """
+
+        cum_sizes, cum_notional = self.cum_sizes, self.cum_notional
+        if len(cum_sizes) == 0 or amount <= 0:
+            return float("nan")
+
+        i = int(cum_sizes.searchsorted(amount))
+        if i >= len(cum_sizes):
+            return float(cum_notional[-1] / cum_sizes[-1])
+
+        if i == 0:
+            return float(self.price_array[0])
+
+        partial = (amount - cum_sizes[i - 1]) * self.price_array[i]
+        return float((cum_notional[i - 1] + partial) / amount)
+
+    @staticmethod
+    def avg_price_for_books(
+        books: Sequence[Book], amounts: np.ndarray | Sequence[float]
+    ) -> np.ndarray:
+        """avg_price_for_books
 
-        total_amount = 0.0
-        total_price = 0.0
+        avg_price_for over many books at once (複数の板の約定平均価格).
 
-        for price, size in self.book:
-            price = float(price)
-            size = float(size)
-            total_amount += size
-            total_price += price * size
+        Returns:
+            np.ndarray: Average prices of shape (len(books), len(amounts)).
 
-            if total_amount >= amount:
-                break
+        """
 
-        return total_price / total_amount
+        amounts = np.asarray(amounts, dtype=np.float64).reshape(-1)
+
+        n, depth = len(books), max((len(b) for b in books), default=0)
+        if depth == 0:
+            return np.full((n, len(amounts)), np.nan)
+
+        lengths = np.array([len(b) for b in books])
+        prices = np.full((n, depth), np.nan)
+        # shorter books are padded with their total size, so every row stays sorted
+        cum_sizes = np.zeros((n, depth))
+        cum_notional = np.zeros((n, depth))
+        for i, b in enumerate(books):
+            k = lengths[i]
+            prices[i, :k] = b.price_array
+            cum_sizes[i, :k] = b.cum_sizes
+            cum_sizes[i, k:] = cum_sizes[i, k - 1] if k else 0.0
+            cum_notional[i, :k] = b.cum_notional
+
+        # row-wise searchsorted in one call: shift each row past the previous one
+        # and count the levels that are fully taken, in O(n * m) memory
+        rows = np.arange(n)[:, None]
+        span = 2.0 * max(cum_sizes.max(), amounts.max(initial=0.0)) + 1.0
+        offsets = rows * span
+        pos = np.searchsorted((cum_sizes + offsets).ravel(), amounts[None, :] + offsets)
+        idx = pos - rows * depth
+        level = np.clip(idx, 0, depth - 1)
+        prev = level - 1
+
+        safe_prev = np.maximum(prev, 0)
+        filled_sizes = np.where(prev >= 0, cum_sizes[rows, safe_prev], 0.0)
+        filled_notional = np.where(prev >= 0, cum_notional[rows, safe_prev], 0.0)
+        notional = filled_notional + (amounts - filled_sizes) * prices[rows, level]
+
+        fillable = (idx < lengths[:, None]) & (amounts > 0)
+        return np.divide(notional, amounts, out=np.full(notional.shape, np.nan), where=fillable)
 
     @property
     def prices(self) -> list[str]:
@@ -66,7 +471,7 @@ class Book:
 
     @property
     def float_prices(self) -> list[float]:
-        return [float(p) for p, _ in self.book]
+        return self.price_array.tolist()
 
     @property
     def prices_with_idx(self) -> list[str]:
@@ -78,7 +483,7 @@ class Book:
 
     @property
     def float_sizes(self) -> list[float]:
-        return [float(s) for _, s in self.book]
+        return self.size_array.tolist()
 
     @property
     def sizes_with_idx(self) -> list[str]:
@@ -100,6 +505,22 @@ class Orderbook:
     def calc_absdiff(self, before: Orderbook) -> Orderbook:
 
         return Orderbook(
-            asks=self.asks.calc_absdiff(before.asks),
-            bids=self.bids.calc_absdiff(before.bids),
+            asks=self.asks.calc_absdiff(before.asks, descending=False),
+            bids=self.bids.calc_absdiff(before.bids, descending=True),
+        )
+
+    @staticmethod
+    def calc_absdiff_series(orderbooks: Sequence[Orderbook]) -> list[Orderbook]:
+        """calc_absdiff of every consecutive pair of a snapshot series."""
+
+        asks = Book.calc_absdiff_series([ob.asks for ob in orderbooks], descending=False)
+        bids = Book.calc_absdiff_series([ob.bids for ob in orderbooks], descending=True)
+
+        return [Orderbook(asks=a, bids=b) for a, b in zip(asks, bids)]
+
+    def with_ticks(self, tick_size: TickSize) -> Orderbook:
+
+        return Orderbook(
+            asks=self.asks.with_ticks(tick_size),
+            bids=self.bids.with_ticks(tick_size),
         )
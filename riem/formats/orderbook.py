@@ -1,16 +1,56 @@
+from __future__ import annotations
+
 from typing import Any
 
+from ..models.core import ModelIdentifier
 from .converter import Converter
 from .molds.orderbook import Book, Orderbook
+from .ticks import TickRegistry
 
 
 class OrderbookConverter(Converter):
+    """OrderbookConverter
+
+    Converts raw orderbooks into Orderbook (板情報の変換).
+
+    Attributes:
+        length (int): Number of levels per side.
+        ticks (TickRegistry | None): Tick and lot sizes.
+            If the symbol is registered, the books are emitted in integer ticks and lots,
+            and a book with a level off the grid formats to None.
+
+    """
 
-    def __init__(self, length: int) -> None:
+    def __init__(self, length: int, ticks: TickRegistry | None = None) -> None:
         self.data_type = "orderbooks"
         self.length = length
+        self.ticks = ticks
+        self.uses_model_identifier = ticks is not None
+
+    def handle(
+        self,
+        exchange_name: str,
+        raw_data: Any,
+        model_identifier: ModelIdentifier | None = None,
+    ) -> Orderbook | None:
+
+        ob = self._handle(exchange_name, raw_data)
+        if ob is None or self.ticks is None or model_identifier is None:
+            return ob
+
+        tick_size = self.ticks.get(
+            model_identifier.exchange_name, model_identifier.arguments.get("symbol")
+        )
+        if tick_size is None:
+            return ob
+
+        try:
+            return ob.with_ticks(tick_size)
+        except ValueError:
+            # a level off the registered grid: drop this book, not the whole batch
+            return None
 
-    def handle(self, exchange_name: str, raw_data: Any) -> Orderbook | None:
+    def _handle(self, exchange_name: str, raw_data: Any) -> Orderbook | None:
 
         if exchange_name == "gmocoin":
             return self.format_from_gmocoin(raw_data)
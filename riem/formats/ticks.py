@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+
+
+@dataclasses.dataclass(frozen=True)
+class TickSize:
+    """TickSize
+
+    Tick size and lot size of a symbol (呼値と数量の単位).
+    Prices and sizes are represented exactly as integer multiples of them.
+    Converting a value that is not on the grid raises ValueError instead of
+    rounding it to the nearest tick or lot.
+
+    Attributes:
+        tick (float): Price increment.
+        lot (float): Size increment.
+
+    """
+
+    tick: float
+    lot: float
+
+    # float noise left after scaling an on-grid value, e.g. 0.3 * 10 == 3.0000000000000004
+    GRID_TOLERANCE = 1e-6
+
+    @staticmethod
+    def _inverse(unit: float) -> int | None:
+
+        # 0.1 -> 10: dividing by an integer is exact where multiplying by 0.1 is not
+        if unit < 1:
+            inv = round(1 / unit)
+            if abs(inv * unit - 1) < 1e-9:
+                return inv
+
+        return None
+
+    @staticmethod
+    def _to_units(values: np.ndarray, unit: float) -> np.ndarray:
+
+        values = np.asarray(values, dtype=np.float64)
+        inv = TickSize._inverse(unit)
+        scaled = values * inv if inv is not None else values / unit
+        units = np.rint(scaled)
+
+        off_grid = np.abs(scaled - units) > TickSize.GRID_TOLERANCE
+        if off_grid.any():
+            raise ValueError(
+                f"{float(values[off_grid][0])!r} is not a multiple of {unit!r} "
+                f"({int(off_grid.sum())} value(s) off the grid)"
+            )
+
+        return units.astype(np.int64)
+
+    @staticmethod
+    def _from_units(units: np.ndarray, unit: float) -> np.ndarray:
+
+        units = np.asarray(units, dtype=np.int64)
+        inv = TickSize._inverse(unit)
+
+        return units / inv if inv is not None else units * unit
+
+    def to_ticks(self, prices: np.ndarray) -> np.ndarray:
+        return self._to_units(prices, self.tick)
+
+    def to_lots(self, sizes: np.ndarray) -> np.ndarray:
+        return self._to_units(sizes, self.lot)
+
+    def from_ticks(self, ticks: np.ndarray) -> np.ndarray:
+        return self._from_units(ticks, self.tick)
+
+    def from_lots(self, lots: np.ndarray) -> np.ndarray:
+        return self._from_units(lots, self.lot)
+
+
+class TickRegistry:
+    """TickRegistry
+
+    Tick and lot sizes per exchange and symbol (取引所・銘柄ごとの呼値).
+
+    Attributes:
+        sizes (dict[str, dict[str, TickSize]]): TickSize per exchange_name and symbol.
+            e.g. {"gmocoin": {"BTC": TickSize(tick=1, lot=0.0001)}}
+
+    """
+
+    def __init__(self, sizes: dict[str, dict[str, TickSize]] | None = None) -> None:
+
+        self.sizes: dict[str, dict[str, TickSize]] = {
+            en: dict(symbols) for en, symbols in (sizes or {}).items()
+        }
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return self.get(*key) is not None
+
+    def register(self, exchange_name: str, symbol: str, tick: float, lot: float) -> None:
+        self.sizes.setdefault(exchange_name, {})[symbol] = TickSize(tick=tick, lot=lot)
+
+    def get(self, exchange_name: str, symbol: str) -> TickSize | None:
+        return self.sizes.get(exchange_name, {}).get(symbol)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import collections
+
+from .models.core import RequestContents
+
+
+class Hedger:
+    """Hedger
+
+    Hedged request policy (ヘッジリクエストの設定).
+    If an idempotent GET has not completed within a percentile of the recent
+    latencies of its exchange, a duplicate request is sent and the first
+    response wins. The delay is measured from the send, after any rate limit
+    wait, and no hedge is sent while the rate limit has no free token.
+
+    Attributes:
+        percentile (float): Percentile of the latency history used as hedge delay.
+        window (int): Number of recent latencies kept per exchange.
+        min_samples (int): Minimum history size before hedging is enabled.
+        data_types (set[str]): Data types eligible for hedging.
+
+        requests (int): Number of hedgeable requests sent.
+        fired (int): Number of hedges sent.
+        won (int): Number of hedges that completed before the original request.
+        throttled (int): Number of hedges skipped because the rate limit had no free token.
+
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        window: int = 256,
+        min_samples: int = 20,
+        data_types: set[str] | None = None,
+    ) -> None:
+
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100.")
+
+        if data_types is None:
+            data_types = {"orderbooks"}
+
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.data_types = data_types
+
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.throttled = 0
+
+        self._latencies: dict[str, collections.deque[float]] = {}
+
+    def hedgeable(self, rc: RequestContents) -> bool:
+        return (
+            rc.http_request_conponents.method == "GET"
+            and rc.model_identifier.data_type in self.data_types
+        )
+
+    def record(self, exchange_name: str, latency: float) -> None:
+        """Add a latency sample. Requests cancelled in flight add their elapsed time as a lower bound."""
+
+        if exchange_name not in self._latencies:
+            self._latencies[exchange_name] = collections.deque(maxlen=self.window)
+
+        self._latencies[exchange_name].append(latency)
+
+    def delay(self, exchange_name: str) -> float | None:
+        """delay
+
+        Hedge delay for the exchange (ヘッジまでの待ち時間).
+
+        Returns:
+            float | None: Delay in seconds, or None if the latency history
+                is too short to hedge.
+
+        """
+
+        latencies = self._latencies.get(exchange_name)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+
+        ordered = sorted(latencies)
+        idx = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+
+        return ordered[idx]
+
+    @property
+    def extra_load(self) -> float:
+        """Ratio of additional requests sent by hedging."""
+
+        if self.requests == 0:
+            return 0.0
+
+        return self.fired / self.requests
+
+    @property
+    def win_rate(self) -> float:
+
+        if self.fired == 0:
+            return 0.0
+
+        return self.won / self.fired
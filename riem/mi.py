@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+import itertools
+from typing import Any, Iterable, Mapping
+
 from .models.core import Exchange, RequestContents
 
 
@@ -20,3 +25,49 @@ class ModelInterface:
 
     def post_order(self, exchange_name: str, **kwargs) -> RequestContents:
         return self.models[exchange_name].post_order(**kwargs)
+
+    def orderbooks_for(
+        self,
+        universe: Mapping[str, Iterable[str | Mapping[str, Any]]],
+    ) -> list[RequestContents]:
+        """orderbooks_for
+
+        Build the orderbook requests of a symbol universe (銘柄ユニバースの板リクエスト).
+        Identical requests are dropped, and the requests are interleaved
+        round-robin across exchanges so that the load is spread evenly.
+
+        Args:
+            universe (Mapping[str, Iterable[str | Mapping[str, Any]]]): Symbols per exchange.
+                Each entry is a symbol or the keyword arguments of get_orderbooks.
+                e.g. {"gmocoin": ["BTC"], "bybit": [{"symbol": "BTCUSDT", "category": "spot"}]}
+
+        Returns:
+            list[RequestContents]: Requests, ready for Client.paralell_fetch.
+
+        """
+
+        seen: set[int] = set()
+        per_exchange: list[list[RequestContents]] = []
+        for exchange_name, entries in universe.items():
+            model = self.models[exchange_name]
+
+            rcs = []
+            for entry in entries:
+                if isinstance(entry, str):
+                    rc = model.get_orderbooks(symbol=entry)
+                else:
+                    rc = model.get_orderbooks(**entry)
+
+                modelkey = rc.model_identifier.modelkey
+                if modelkey not in seen:
+                    seen.add(modelkey)
+                    rcs.append(rc)
+
+            per_exchange.append(rcs)
+
+        return [
+            rc
+            for group in itertools.zip_longest(*per_exchange)
+            for rc in group
+            if rc is not None
+        ]
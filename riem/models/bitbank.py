@@ -34,7 +34,7 @@ class Bitbank(Exchange):
                 url=url,
                 method=method,
             ),
-            model_identifier=ModelIdentifier(
+            model_identifier=ModelIdentifier.intern(
                 exchange_name=cls.exchange_name,
                 data_type="orderbooks",
                 arguments={"symbol": symbol},
@@ -52,7 +52,7 @@ class Bitbank(Exchange):
                 url=url,
                 method=method,
             ),
-            model_identifier=ModelIdentifier(
+            model_identifier=ModelIdentifier.intern(
                 exchange_name=cls.exchange_name,
                 data_type="assets",
                 arguments={},
@@ -38,7 +38,7 @@ class Bybit(Exchange):
                 method=method,
                 params=params,
             ),
-            model_identifier=ModelIdentifier(
+            model_identifier=ModelIdentifier.intern(
                 exchange_name=cls.exchange_name,
                 data_type="orderbooks",
                 arguments={"symbol": symbol, "category": category},
@@ -72,7 +72,7 @@ class Bybit(Exchange):
                 method=method,
                 params=params,
             ),
-            model_identifier=ModelIdentifier(
+            model_identifier=ModelIdentifier.intern(
                 exchange_name=cls.exchange_name,
                 data_type="assets",
                 arguments={},
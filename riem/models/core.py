@@ -1,11 +1,45 @@
 
 from abc import ABCMeta, abstractmethod
 import dataclasses
-from typing import Any, Literal
+import struct
+from typing import Any, ClassVar, Literal
 
 import xxhash
 
 
+def _signed64(n: int) -> int:
+    return n - (1 << 64) if n >= (1 << 63) else n
+
+
+def _combine_components(components: tuple[int, int, int]) -> int:
+    return _signed64(xxhash.xxh64_intdigest(struct.pack(">3Q", *components)))
+
+
+def as_modelkey(modelhash: str | int) -> int:
+    """ as_modelkey
+
+    Convert a modelhash to its modelkey (モデルハッシュをモデルキーに変換).
+    A modelkey is returned as is.
+
+    Args:
+        modelhash (str | int): Hex modelhash or modelkey.
+
+    Returns:
+        int: Modelkey.
+
+    """
+
+    if isinstance(modelhash, int):
+        return modelhash
+
+    if len(modelhash) != 48:
+        raise ValueError(f"invalid modelhash: {modelhash!r}")
+
+    return _combine_components(
+        (int(modelhash[0:16], 16), int(modelhash[16:32], 16), int(modelhash[32:48], 16))
+    )
+
+
 @dataclasses.dataclass
 class HTTPRequestConponents:
     """ HTTPRequestConponents
@@ -29,28 +63,107 @@ class HTTPRequestConponents:
     data: dict = dataclasses.field(default_factory=dict)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, eq=False)
 class ModelIdentifier:
     """ ModelIdentifier
 
     Identifier for the model (モデル識別情報).
     Contains the information to identify the model.
+    Identifiers are equal when their modelhash is equal. Use intern() to
+    reuse one instance per model, so that equal identifiers are identical.
 
     Attributes:
         exchange_name (str): Exchange name.
         data_type (str): Data type.
         arguments (dict[str, Any]): Arguments for the request.
 
+        components (tuple[int, int, int]): xxh64 digests of exchange_name,
+            data_type and the argstext.
+        modelhash (str): Hex form of the components (48 chars).
+        modelkey (int): Signed 64-bit key combining the components.
+            Used for in-memory indexes and as the indexed database key.
+
     """
 
     exchange_name: str
     data_type: str
     arguments: dict[str, Any] = dataclasses.field(default_factory=dict)
 
+    components: tuple[int, int, int] = dataclasses.field(init=False, repr=False)
     modelhash: str = dataclasses.field(init=False)
+    modelkey: int = dataclasses.field(init=False, repr=False)
+
+    _interned: ClassVar[dict[tuple, "ModelIdentifier"]] = {}
+    intern_maxsize: ClassVar[int] = 65536
 
     def __post_init__(self) -> None:
-        self.modelhash = self.generate_modelhash()
+
+        self.components = self.generate_components()
+        self.modelhash = "".join(format(c, "016x") for c in self.components)
+        self.modelkey = _combine_components(self.components)
+
+    def __eq__(self, other: object) -> bool:
+
+        if self is other:
+            return True
+
+        if not isinstance(other, ModelIdentifier):
+            return NotImplemented
+
+        return self.modelhash == other.modelhash
+
+    def __hash__(self) -> int:
+        return self.modelkey
+
+    @classmethod
+    def intern(
+        cls,
+        exchange_name: str,
+        data_type: str,
+        arguments: dict[str, Any] | None = None,
+    ) -> "ModelIdentifier":
+        """ intern
+
+        Get the shared identifier for the model (共有のモデル識別情報を取得).
+        The argstext and modelhash are computed only the first time.
+        Interned identifiers are shared, so they must not be mutated.
+
+        Args:
+            exchange_name (str): Exchange name.
+            data_type (str): Data type.
+            arguments (dict[str, Any] | None): Arguments for the request.
+
+        Returns:
+            ModelIdentifier: Interned identifier.
+
+        """
+
+        arguments = arguments or {}
+
+        # key on what the modelhash uses: 1, True and 1.0 are equal but hash differently
+        key = (
+            exchange_name,
+            data_type,
+            frozenset((k, str(v)) for k, v in arguments.items()),
+        )
+
+        mi = cls._interned.get(key)
+        if mi is None:
+            if len(cls._interned) >= cls.intern_maxsize:
+                del cls._interned[next(iter(cls._interned))]
+
+            mi = cls(exchange_name, data_type, dict(arguments))
+            cls._interned[key] = mi
+
+        return mi
+
+    def generate_components(self) -> tuple[int, int, int]:
+
+        return (
+            xxhash.xxh64_intdigest(self.exchange_name),
+            xxhash.xxh64_intdigest(self.data_type),
+            xxhash.xxh64_intdigest(self.generate_argstext(self.arguments)),
+        )
 
     def generate_modelhash(self) -> str:
         """ generate_modelhash
@@ -38,7 +38,7 @@ class Gmocoin(Exchange):
                 method=method,
                 params=params,
             ),
-            model_identifier=ModelIdentifier(
+            model_identifier=ModelIdentifier.intern(
                 exchange_name=cls.exchange_name,
                 data_type="orderbooks",
                 arguments={"symbol": symbol},
@@ -56,7 +56,7 @@ class Gmocoin(Exchange):
                 url=url,
                 method=method,
             ),
-            model_identifier=ModelIdentifier(
+            model_identifier=ModelIdentifier.intern(
                 exchange_name=cls.exchange_name,
                 data_type="assets",
                 arguments={},
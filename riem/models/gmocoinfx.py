@@ -37,7 +37,7 @@ class Gmocoinfx(Exchange):
                 url=url,
                 method=method,
             ),
-            model_identifier=ModelIdentifier(
+            model_identifier=ModelIdentifier.intern(
                 exchange_name=cls.exchange_name,
                 data_type='ticker',
                 arguments={},
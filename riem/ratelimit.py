@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+from typing import Literal
+
+from .models.core import ModelIdentifier
+
+Scope = Literal["public", "private"]
+
+
+@dataclasses.dataclass(frozen=True)
+class RateLimit:
+    """RateLimit
+
+    Budget of a token bucket (トークンバケットの予算).
+
+    Attributes:
+        rate (float): Tokens refilled per second.
+        capacity (int): Maximum number of tokens (burst size).
+
+    """
+
+    rate: float
+    capacity: int
+
+
+# Conservative defaults per exchange. Override them to match your account tier.
+DEFAULT_RATE_LIMITS: dict[str, dict[Scope, RateLimit]] = {
+    "gmocoin": {
+        "public": RateLimit(rate=6, capacity=6),
+        "private": RateLimit(rate=6, capacity=6),
+    },
+    "gmocoinfx": {
+        "public": RateLimit(rate=6, capacity=6),
+        "private": RateLimit(rate=6, capacity=6),
+    },
+    "bitbank": {
+        "public": RateLimit(rate=10, capacity=10),
+        "private": RateLimit(rate=6, capacity=6),
+    },
+    "bybit": {
+        "public": RateLimit(rate=100, capacity=100),
+        "private": RateLimit(rate=10, capacity=10),
+    },
+}
+
+
+class TokenBucket:
+    """TokenBucket
+
+    Token bucket (トークンバケット).
+    Waiters are released in FIFO order as soon as a token is available.
+
+    Attributes:
+        rate (float): Tokens refilled per second.
+        capacity (int): Maximum number of tokens.
+        tokens (float): Currently available tokens.
+
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1.")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+
+            self.tokens -= 1
+
+    def try_acquire(self) -> bool:
+        """Take a token without waiting. False if none is free or others are queued."""
+
+        if self._lock.locked():
+            return False
+
+        self._refill()
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+    @property
+    def waiting(self) -> bool:
+        return self._lock.locked()
+
+
+class RateLimiter:
+    """RateLimiter
+
+    Per-exchange request scheduler (取引所ごとのリクエストスケジューラ).
+    Keeps one token bucket per `ModelIdentifier.exchange_name` and scope
+    (public / private). Requests for exchanges without a budget are not limited.
+
+    Attributes:
+        limits (dict[str, dict[Scope, RateLimit]]): Budgets per exchange and scope.
+        private_data_types (set[str]): Data types sent to private endpoints.
+        buckets (dict[tuple[str, Scope], TokenBucket]): Token buckets.
+
+    """
+
+    private_data_types: set[str] = {"assets", "orders"}
+
+    def __init__(
+        self, limits: dict[str, dict[Scope, RateLimit]] | None = None
+    ) -> None:
+
+        if limits is None:
+            limits = DEFAULT_RATE_LIMITS
+
+        self.limits = limits
+        self.buckets: dict[tuple[str, Scope], TokenBucket] = {}
+
+    def scope(self, model_identifier: ModelIdentifier) -> Scope:
+
+        if model_identifier.data_type in self.private_data_types:
+            return "private"
+
+        return "public"
+
+    def bucket(self, model_identifier: ModelIdentifier) -> TokenBucket | None:
+
+        en = model_identifier.exchange_name
+        scope = self.scope(model_identifier)
+
+        key = (en, scope)
+        if key not in self.buckets:
+            limit = self.limits.get(en, {}).get(scope)
+            if limit is None:
+                return None
+
+            self.buckets[key] = TokenBucket(rate=limit.rate, capacity=limit.capacity)
+
+        return self.buckets[key]
+
+    async def acquire(self, model_identifier: ModelIdentifier) -> None:
+
+        bucket = self.bucket(model_identifier)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def try_acquire(self, model_identifier: ModelIdentifier) -> bool:
+
+        bucket = self.bucket(model_identifier)
+        if bucket is None:
+            return True
+
+        return bucket.try_acquire()
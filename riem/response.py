@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import bisect
 import dataclasses
-import datetime
-from typing import Any, Callable, Literal
+import functools
+from typing import Any, Callable, Iterable, Literal
 
+import numpy as np
 import xxhash
 
-from .models.core import ModelIdentifier, RequestContents
+from . import clock
+from .models.core import ModelIdentifier, RequestContents, as_modelkey
+from .timing import StageTimings
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ClientResponse:
     """ClientResponse
 
@@ -18,28 +22,228 @@ class ClientResponse:
 
     Attributes:
         model_identifier (ModelIdentifier): Model identifier.
-        acq_source (Literal['HTTP', 'DB']): Acquisition source.
+        acq_source (Literal['HTTP', 'DB', 'CACHE', 'WS']): Acquisition source.
         raw_data (Any): Raw data decoded from JSON.
         formatted_data (Any): Formatted data.
-
-        ts (float): Timestamp.
+            With a lazy Formatter, computed on first access and memoized
+            (shared with the copies of the response).
+        server_ts (float | None): Exchange server timestamp, if the payload has one.
+        timings (StageTimings | None): Monotonic timestamps of each stage.
+            Only responses fetched over HTTP by riem.Client have them.
+        status (int | None): HTTP status code, for responses fetched over HTTP.
+
+        ts (float): Timestamp (see riem.clock.now).
         model_hash (str): Model hash.
             See models.core.ModelIdentifier for more details.
+        modelkey (int): Integer model key.
 
     """
 
     model_identifier: ModelIdentifier
-    acq_source: Literal["HTTP", "DB"]
+    acq_source: Literal["HTTP", "DB", "CACHE", "WS"]
     raw_data: Any
     formatted_data: Any = None
+    server_ts: float | None = None
+    timings: StageTimings | None = None
+    status: int | None = None
 
     modelhash: str = dataclasses.field(init=False)
+    modelkey: int = dataclasses.field(init=False, repr=False)
     ts: float = dataclasses.field(init=False)
 
+    # conversion run on the first access of formatted_data (see Formatter(lazy=True))
+    pending_format: Callable[[ClientResponse], Any] | None = dataclasses.field(
+        init=False, default=None, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
 
         self.modelhash = self.model_identifier.modelhash
-        self.ts = datetime.datetime.now().timestamp()
+        self.modelkey = self.model_identifier.modelkey
+        self.ts = clock.now()
+
+    def copy(self) -> ClientResponse:
+        """copy
+
+        Shallow copy with its own timings (レスポンスの浅いコピー).
+        A pending conversion is shared with the copy: it runs once, on
+        whichever of them is read first.
+
+        """
+
+        pending = self.pending_format
+        if pending is not None and not isinstance(pending, _SharedFormat):
+            self.pending_format = _SharedFormat(pending)
+
+        cr = object.__new__(ClientResponse)
+        for slot in _RAW_SLOTS:
+            slot.__set__(cr, slot.__get__(self, ClientResponse))
+
+        if self.timings is not None:
+            cr.timings = dataclasses.replace(self.timings)
+
+        return cr
+
+    # repr and eq as generated by dataclass, except that a pending conversion is not run
+
+    def __repr__(self) -> str:
+
+        fields = []
+        for f in dataclasses.fields(self):
+            if not f.repr:
+                continue
+
+            if f.name == "formatted_data" and self.pending_format is not None:
+                fields.append("formatted_data=<pending>")
+            else:
+                fields.append(f"{f.name}={getattr(self, f.name)!r}")
+
+        return f"ClientResponse({', '.join(fields)})"
+
+    def __eq__(self, other: object) -> bool:
+
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+
+        for f in dataclasses.fields(self):
+            if f.compare and f.name != "formatted_data":
+                if getattr(self, f.name) != getattr(other, f.name):
+                    return False
+
+        # the same raw data waiting for the same conversion formats the same
+        if self.pending_format is not None and self.pending_format == other.pending_format:
+            return True
+
+        return self.formatted_data == other.formatted_data
+
+    @property
+    def staleness(self) -> float | None:
+        """Seconds between the exchange server timestamp and ts."""
+
+        if self.server_ts is None:
+            return None
+
+        return self.ts - self.server_ts
+
+
+class _SharedFormat:
+    """Pending conversion shared by a response and its copies; the result is memoized for all of them."""
+
+    __slots__ = ("convert", "done", "value")
+
+    def __init__(self, convert: Callable[[ClientResponse], Any]) -> None:
+
+        self.convert = convert
+        self.done = False
+        self.value: Any = None
+
+    def __call__(self, cr: ClientResponse) -> Any:
+
+        if not self.done:
+            self.value = self.convert(cr)
+            self.done = True
+
+        return self.value
+
+
+class _LazyFormattedData:
+    """Descriptor over the formatted_data slot that runs a pending conversion on read."""
+
+    def __init__(self, slot: Any) -> None:
+        # the raw slot, for readers that must not trigger the conversion
+        self.slot = slot
+
+    def __get__(self, cr: ClientResponse | None, owner: type | None = None) -> Any:
+
+        if cr is None:
+            return self
+
+        pending = cr.pending_format
+        if pending is not None:
+            # only clear once the conversion succeeded, so that a failure is raised again
+            self.slot.__set__(cr, pending(cr))
+            cr.pending_format = None
+
+        return self.slot.__get__(cr, owner)
+
+    def __set__(self, cr: ClientResponse, value: Any) -> None:
+
+        cr.pending_format = None
+        self.slot.__set__(cr, value)
+
+
+ClientResponse.formatted_data = _LazyFormattedData(ClientResponse.formatted_data)
+
+_RAW_SLOTS = [
+    getattr(ClientResponse.__dict__[name], "slot", ClientResponse.__dict__[name])
+    for name in ClientResponse.__slots__
+]
+
+
+class TimeIndex:
+    """TimeIndex
+
+    Response indices ordered by timestamp (タイムスタンプ順のインデックス).
+    Kept sorted with bisect; appending in timestamp order is O(1) amortized.
+
+    Attributes:
+        tss (list[float]): Sorted timestamps.
+        idxs (list[int]): Response indices aligned with tss.
+
+    """
+
+    __slots__ = ("tss", "idxs")
+
+    def __init__(self) -> None:
+
+        self.tss: list[float] = []
+        self.idxs: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.tss)
+
+    def insert(self, ts: float, i: int) -> None:
+
+        if not self.tss or ts >= self.tss[-1]:
+            self.tss.append(ts)
+            self.idxs.append(i)
+            return
+
+        pos = bisect.bisect_right(self.tss, ts)
+        self.tss.insert(pos, ts)
+        self.idxs.insert(pos, i)
+
+    def between(self, t0: float, t1: float) -> list[int]:
+
+        lo = bisect.bisect_left(self.tss, t0)
+        hi = bisect.bisect_right(self.tss, t1)
+
+        return self.idxs[lo:hi]
+
+    def asof(self, t: float) -> int | None:
+
+        pos = bisect.bisect_right(self.tss, t)
+        if pos == 0:
+            return None
+
+        return self.idxs[pos - 1]
+
+
+@functools.lru_cache(maxsize=4096)
+def _component_hash(text: str) -> int:
+    return xxhash.xxh64_intdigest(text)
+
+
+def _levels_matrix(books: list[Any], depth: int) -> tuple[np.ndarray, np.ndarray]:
+
+    prices = np.full((len(books), depth), np.nan)
+    sizes = np.full((len(books), depth), np.nan)
+    for i, book in enumerate(books):
+        n = min(depth, len(book))
+        prices[i, :n] = book.price_array[:n]
+        sizes[i, :n] = book.size_array[:n]
+
+    return prices, sizes
 
 
 @dataclasses.dataclass
@@ -52,17 +256,28 @@ class ClientResponseProxy:
     Attributes:
         responses (list[ClientResponse]): List of ClientResponse.
         mapping (bool): Whether to use mapping.
-            If False, can't use all methods that use hash_idxs_map.
+            If False, can't use all methods that use hash_idxs_map, and
+            between, latest, latest_per_key and asof raise ValueError.
             To re-enable mapping, use remap_hash_idxs().
 
-        hash_idxs_map (dict[str, set[int]]): Hash index map.
+        hash_idxs_map (dict[int, set[int]]): Hash index map.
+            Maps each component of ModelIdentifier.components to response indices.
+        modelkey_idxs_map (dict[int, list[int]]): Exact-match index.
+            Maps each modelkey to response indices in insertion order.
+        ts_index (TimeIndex): Timestamp-ordered index of all responses.
+        modelkey_ts_map (dict[int, TimeIndex]): Timestamp-ordered index per modelkey.
+
+    Methods taking a modelhash accept either the hex modelhash or the modelkey.
 
     """
 
     responses: list[ClientResponse]
     mapping: bool = True
 
-    hash_idxs_map: dict[str, set[int]] = dataclasses.field(default_factory=dict)
+    hash_idxs_map: dict[int, set[int]] = dataclasses.field(default_factory=dict)
+    modelkey_idxs_map: dict[int, list[int]] = dataclasses.field(default_factory=dict)
+    ts_index: TimeIndex = dataclasses.field(default_factory=TimeIndex)
+    modelkey_ts_map: dict[int, TimeIndex] = dataclasses.field(default_factory=dict)
 
     def __post_init__(self) -> None:
 
@@ -90,19 +305,64 @@ class ClientResponseProxy:
     def _map_hash_idxs(self) -> None:
 
         for i, r in enumerate(self.responses):
-            for j in range(0, len(r.modelhash), 16):
+            self._map_hash_idx(i, r)
+
+    def _map_hash_idx(self, i: int, r: ClientResponse) -> None:
 
-                h = r.modelhash[j : j + 16]
-                if h not in self.hash_idxs_map.keys():
-                    self.hash_idxs_map[h] = set()
+        modelkey, ts = r.modelkey, r.ts
+        components = r.model_identifier.components
+        self.ts_index.insert(ts, i)
 
+        idxs = self.modelkey_idxs_map.get(modelkey)
+        if idxs is not None:
+            # components are already indexed by the first response of this modelkey
+            idxs.append(i)
+            self.modelkey_ts_map[modelkey].insert(ts, i)
+            for h in components:
                 self.hash_idxs_map[h].add(i)
+            return
+
+        self.modelkey_idxs_map[modelkey] = [i]
+        ti = self.modelkey_ts_map[modelkey] = TimeIndex()
+        ti.insert(ts, i)
+
+        for h in components:
+            self.hash_idxs_map.setdefault(h, set()).add(i)
+
+    def append(self, response: ClientResponse) -> None:
+        """append
+
+        Append a response in place (レスポンスを追加).
+        hash_idxs_map is updated incrementally if mapping is enabled.
+
+        """
+
+        self.responses.append(response)
+        if self.mapping:
+            self._map_hash_idx(len(self.responses) - 1, response)
+
+    def extend(self, responses: Iterable[ClientResponse]) -> None:
+
+        for response in responses:
+            self.append(response)
 
     def remap_hash_idxs(self) -> None:
 
+        self.mapping = True
         self.hash_idxs_map = {}
+        self.modelkey_idxs_map = {}
+        self.ts_index = TimeIndex()
+        self.modelkey_ts_map = {}
         self._map_hash_idxs()
 
+    def _union(self, hashes: list[int]) -> set[int]:
+
+        u: set[int] = set()
+        for h in hashes:
+            u |= self.hash_idxs_map.get(h, set())
+
+        return u
+
     def _find(
         self,
         exchange_names: list[str] | None = None,
@@ -110,31 +370,43 @@ class ClientResponseProxy:
         arguments_list: list[dict[str, Any]] | None = None,
     ) -> list[tuple[int, ClientResponse]]:
 
-        enu = set(range(len(self)))
+        # None means "no condition"; only the given conditions are intersected
+        conditions: list[set[int]] = []
+
         if exchange_names is not None:
-            enu = set()
-            for en in exchange_names:
-                h = xxhash.xxh64(en).hexdigest()
-                enu = enu | self.hash_idxs_map[h]
+            conditions.append(self._union([_component_hash(en) for en in exchange_names]))
 
-        dtu = set(range(len(self)))
         if data_types is not None:
-            dtu = set()
-            for dt in data_types:
-                h = xxhash.xxh64(dt).hexdigest()
-                dtu = dtu | self.hash_idxs_map[h]
+            conditions.append(self._union([_component_hash(dt) for dt in data_types]))
 
-        au = set(range(len(self)))
         if arguments_list is not None:
-            au = set()
-            for a in arguments_list:
-                atext = ModelIdentifier.generate_argstext(a)
-                h = xxhash.xxh64(atext).hexdigest()
-                au = au | self.hash_idxs_map[h]
+            conditions.append(
+                self._union(
+                    [
+                        _component_hash(ModelIdentifier.generate_argstext(a))
+                        for a in arguments_list
+                    ]
+                )
+            )
+
+        if not conditions:
+            return list(enumerate(self.responses))
+
+        conditions.sort(key=len)
+        indices = conditions[0].intersection(*conditions[1:])
 
-        indices = enu & dtu & au
+        return [(i, self.responses[i]) for i in sorted(indices)]
 
-        return [(i, self.responses[i]) for i in indices]
+    def arg_find_by_hash(self, modelhash: str | int) -> list[int]:
+        """Indices of the responses with exactly this modelhash, in O(1)."""
+
+        return self.modelkey_idxs_map.get(as_modelkey(modelhash), [])
+
+    def find_by_hash(self, modelhash: str | int) -> ClientResponseProxy:
+
+        return ClientResponseProxy(
+            responses=[self.responses[i] for i in self.arg_find_by_hash(modelhash)]
+        )
 
     def find(
         self,
@@ -159,19 +431,48 @@ class ClientResponseProxy:
         return [i for i, _ in self._find(exchange_names, data_types, arguments_list)]
 
     def mfind(self, *requests: RequestContents) -> ClientResponseProxy:
+        """mfind
 
-        return ClientResponseProxy(
-            responses=[
-                r
-                for _, r in self._find(
-                    [r.exchange_name for r in requests],
-                    [r.data_type for r in requests],
-                    [r.arguments for r in requests],
-                )
-            ]
-        )
+        Responses that exactly match any of the requests (リクエストに一致するレスポンス).
+        Responses are returned grouped in the order of the requests.
+
+        """
+
+        seen: set[int] = set()
+        responses: list[ClientResponse] = []
+        for req in requests:
+            modelkey = req.model_identifier.modelkey
+            if modelkey in seen:
+                continue
+
+            seen.add(modelkey)
+            responses.extend(self.responses[i] for i in self.arg_find_by_hash(modelkey))
+
+        return ClientResponseProxy(responses=responses)
+
+    def group_find(self, *requests: RequestContents) -> list[ClientResponseProxy]:
+        """group_find
+
+        Responses matching each request (リクエストごとのレスポンス).
+
+        Returns:
+            list[ClientResponseProxy]: One proxy per request, in the same order.
+
+        """
+
+        return [self.find_by_hash(req.model_identifier.modelkey) for req in requests]
 
     def sort_by_ts(self, desc=False) -> ClientResponseProxy:
+        """Responses in timestamp order, as an unmapped proxy."""
+
+        if self.mapping:
+            idxs = self.ts_index.idxs
+            if desc:
+                idxs = idxs[::-1]
+
+            return ClientResponseProxy(
+                responses=[self.responses[i] for i in idxs], mapping=False
+            )
 
         return ClientResponseProxy(
             responses=[
@@ -185,6 +486,69 @@ class ClientResponseProxy:
             mapping=False,
         )
 
+    def _require_mapping(self) -> None:
+
+        # the indexes are empty on an unmapped proxy, which would look like no match
+        if not self.mapping:
+            raise ValueError("mapping is disabled, use remap_hash_idxs() first.")
+
+    def between(self, t0: float, t1: float) -> ClientResponseProxy:
+        """between
+
+        Responses with t0 <= ts <= t1, in timestamp order (期間内のレスポンス).
+
+        """
+
+        self._require_mapping()
+        return ClientResponseProxy(
+            responses=[self.responses[i] for i in self.ts_index.between(t0, t1)]
+        )
+
+    def latest(self, modelhash: str | int) -> ClientResponse | None:
+        """Latest response for the modelhash, or None."""
+
+        self._require_mapping()
+        index = self.modelkey_ts_map.get(as_modelkey(modelhash))
+        if index is None:
+            return None
+
+        return self.responses[index.idxs[-1]]
+
+    def latest_per_key(self) -> ClientResponseProxy:
+        """Latest response for every modelhash."""
+
+        self._require_mapping()
+        return ClientResponseProxy(
+            responses=[self.responses[ti.idxs[-1]] for ti in self.modelkey_ts_map.values()]
+        )
+
+    def asof(self, t: float, modelhash: str | int | None = None) -> ClientResponseProxy:
+        """asof
+
+        Latest response per modelhash with ts <= t (時刻 t 時点の最新レスポンス).
+
+        Args:
+            t (float): Timestamp.
+            modelhash (str | int | None): If given, only this modelhash is searched.
+
+        """
+
+        self._require_mapping()
+        if modelhash is None:
+            indices = self.modelkey_ts_map.values()
+        elif (modelkey := as_modelkey(modelhash)) in self.modelkey_ts_map:
+            indices = [self.modelkey_ts_map[modelkey]]
+        else:
+            indices = []
+
+        responses = []
+        for index in indices:
+            i = index.asof(t)
+            if i is not None:
+                responses.append(self.responses[i])
+
+        return ClientResponseProxy(responses=responses)
+
     def map_to_responses(
         self, f: Callable[[ClientResponse], ClientResponse]
     ) -> ClientResponseProxy:
@@ -207,6 +571,79 @@ class ClientResponseProxy:
 
         return ClientResponseProxy(responses=new_resps)
     
+    def to_columns(self, data_type: str, depth: int | None = None) -> dict[str, np.ndarray]:
+        """to_columns
+
+        Columnar view of the formatted responses (列指向の NumPy 配列に変換).
+        Responses of other data types, or without formatted data, are skipped.
+
+        Args:
+            data_type (str): "orderbooks" or "ticker".
+            depth (int | None): Number of levels per side for orderbooks.
+                Defaults to the deepest book. Shorter books are padded with NaN.
+
+        Returns:
+            dict[str, np.ndarray]: Arrays that share the first axis (one row per response).
+                Common keys are "ts" (float64), "exchange" and "symbol" (str).
+                Orderbooks add "ask_price", "ask_size", "bid_price" and "bid_size"
+                of shape (n, depth). Tickers add "symbols" (str, shape (m,)) and
+                "ask" and "bid" of shape (n, m).
+
+        """
+
+        if self.mapping:
+            responses = [r for _, r in self._find(data_types=[data_type])]
+        else:
+            responses = [r for r in self.responses if r.model_identifier.data_type == data_type]
+
+        rows: list[tuple[ClientResponse, Any]] = []
+        for r in responses:
+            fd = r.formatted_data
+            if fd is not None:
+                rows.append((r, fd))
+
+        columns: dict[str, np.ndarray] = {
+            "ts": np.array([r.ts for r, _ in rows], dtype=np.float64),
+            "exchange": np.array([r.model_identifier.exchange_name for r, _ in rows], dtype=str),
+            "symbol": np.array(
+                [str(r.model_identifier.arguments.get("symbol", "")) for r, _ in rows], dtype=str
+            ),
+        }
+
+        if data_type == "orderbooks":
+            if depth is None:
+                depth = max((max(len(fd.asks), len(fd.bids)) for _, fd in rows), default=0)
+
+            columns["ask_price"], columns["ask_size"] = _levels_matrix(
+                [fd.asks for _, fd in rows], depth
+            )
+            columns["bid_price"], columns["bid_size"] = _levels_matrix(
+                [fd.bids for _, fd in rows], depth
+            )
+
+        elif data_type == "ticker":
+            symbols = list(dict.fromkeys(s for _, fd in rows for s in fd.ticker_detail))
+            col = {s: j for j, s in enumerate(symbols)}
+
+            # flatten every (row, symbol) cell once and scatter the columns in one go
+            cells = [(i, s, d) for i, (_, fd) in enumerate(rows) for s, d in fd.ticker_detail.items()]
+            row_idx = np.fromiter((i for i, _, _ in cells), dtype=np.intp, count=len(cells))
+            col_idx = np.fromiter((col[s] for _, s, _ in cells), dtype=np.intp, count=len(cells))
+
+            ask = np.full((len(rows), len(symbols)), np.nan)
+            bid = np.full((len(rows), len(symbols)), np.nan)
+            ask[row_idx, col_idx] = np.array([d["ask"] for _, _, d in cells], dtype=np.float64)
+            bid[row_idx, col_idx] = np.array([d["bid"] for _, _, d in cells], dtype=np.float64)
+
+            columns["symbols"] = np.array(symbols, dtype=str)
+            columns["ask"] = ask
+            columns["bid"] = bid
+
+        else:
+            raise ValueError(f"unsupported data_type: {data_type}")
+
+        return columns
+
     def first(self) -> ClientResponse:
         return self.responses[0]
     
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import collections
+import sys
+from typing import Any, Iterable, Iterator
+
+from . import clock
+from .models.core import RequestContents, as_modelkey
+from .response import ClientResponse, ClientResponseProxy
+
+
+def _deep_sizeof(obj: Any, seen: set[int]) -> int:
+
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, int, float, bool, type(None))):
+            if hasattr(o, "__dict__"):
+                stack.append(o.__dict__)
+            for cls in type(o).__mro__:
+                for slot in cls.__dict__.get("__slots__", ()):
+                    # read the raw slot: ClientResponse.formatted_data would run a
+                    # pending conversion
+                    descriptor = cls.__dict__.get(slot)
+                    descriptor = getattr(descriptor, "slot", descriptor)
+                    try:
+                        stack.append(descriptor.__get__(o, cls))
+                    except AttributeError:
+                        pass
+
+    return size
+
+
+class ResponseStore:
+    """ResponseStore
+
+    Bounded rolling history of responses (レスポンスのリングバッファ).
+    Keeps the last `maxlen` responses and/or the responses of the last
+    `max_age` seconds per modelhash. The oldest response is evicted in O(1).
+
+    Attributes:
+        maxlen (int | None): Maximum number of responses per modelhash.
+        max_age (float | None): Maximum age in seconds, based on ClientResponse.ts.
+        drop_raw (bool): Whether to drop raw_data of responses that were formatted.
+            The response is modified in place. Responses whose lazy conversion
+            is still pending keep their raw_data.
+        buffers (dict[int, collections.deque[ClientResponse]]): Responses per modelkey,
+            oldest first.
+        evicted (int): Number of evicted responses.
+
+    """
+
+    def __init__(
+        self,
+        maxlen: int | None = 1000,
+        max_age: float | None = None,
+        drop_raw: bool = False,
+    ) -> None:
+
+        if maxlen is None and max_age is None:
+            raise ValueError("either maxlen or max_age is required.")
+
+        self.maxlen = maxlen
+        self.max_age = max_age
+        self.drop_raw = drop_raw
+
+        self.buffers: dict[int, collections.deque[ClientResponse]] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return sum(len(buf) for buf in self.buffers.values())
+
+    def __iter__(self) -> Iterator[ClientResponse]:
+        for buf in self.buffers.values():
+            yield from buf
+
+    def __contains__(self, modelhash: str | int) -> bool:
+        return as_modelkey(modelhash) in self.buffers
+
+    def append(self, response: ClientResponse) -> None:
+
+        # a lazily formatted response still needs its raw data
+        if (
+            self.drop_raw
+            and response.pending_format is None
+            and response.formatted_data is not None
+        ):
+            response.raw_data = None
+
+        buf = self.buffers.get(response.modelkey)
+        if buf is None:
+            buf = collections.deque(maxlen=self.maxlen)
+            self.buffers[response.modelkey] = buf
+
+        if self.maxlen is not None and len(buf) == self.maxlen:
+            self.evicted += 1
+
+        buf.append(response)
+        self._expire(buf, clock.now())
+
+    def extend(self, responses: Iterable[ClientResponse]) -> None:
+
+        for response in responses:
+            self.append(response)
+
+    def _expire(self, buf: collections.deque[ClientResponse], now: float) -> None:
+
+        if self.max_age is None:
+            return
+
+        limit = now - self.max_age
+        while buf and buf[0].ts < limit:
+            buf.popleft()
+            self.evicted += 1
+
+    def expire(self) -> None:
+        """Evict the responses older than max_age from every buffer."""
+
+        now = clock.now()
+        for modelkey in list(self.buffers):
+            buf = self.buffers[modelkey]
+            self._expire(buf, now)
+            if not buf:
+                del self.buffers[modelkey]
+
+    def latest(self, modelhash: str | int) -> ClientResponse | None:
+        """Newest response of the modelhash, or None if it has none within max_age."""
+
+        modelkey = as_modelkey(modelhash)
+        buf = self.buffers.get(modelkey)
+        if buf is None:
+            return None
+
+        # only this buffer: latest() stays O(1) however many keys are stored
+        self._expire(buf, clock.now())
+        if not buf:
+            del self.buffers[modelkey]
+            return None
+
+        return buf[-1]
+
+    def latest_per_key(self) -> ClientResponseProxy:
+
+        self.expire()
+        return ClientResponseProxy(responses=[buf[-1] for buf in self.buffers.values() if buf])
+
+    def history(self, modelhash: str | int) -> ClientResponseProxy:
+        """Responses of the modelhash, oldest first."""
+
+        self.expire()
+        buf = self.buffers.get(as_modelkey(modelhash), ())
+        return ClientResponseProxy(responses=list(buf))
+
+    def mfind(self, *requests: RequestContents) -> ClientResponseProxy:
+
+        self.expire()
+
+        responses: list[ClientResponse] = []
+        for modelkey in dict.fromkeys(r.model_identifier.modelkey for r in requests):
+            responses.extend(self.buffers.get(modelkey, ()))
+
+        return ClientResponseProxy(responses=responses)
+
+    def to_proxy(self) -> ClientResponseProxy:
+        """All retained responses as a ClientResponseProxy."""
+
+        self.expire()
+        return ClientResponseProxy(responses=list(self))
+
+    def memory_footprint(self) -> int:
+        """Approximate memory used by the retained responses, in bytes."""
+
+        seen: set[int] = set()
+        size = sys.getsizeof(self.buffers)
+        for buf in self.buffers.values():
+            size += _deep_sizeof(buf, seen)
+
+        return size
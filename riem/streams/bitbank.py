@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+
+from .core import OrderbookChannel
+
+
+class BitbankOrderbookChannel(OrderbookChannel):
+    """Orderbook channel for bitbank public stream (socket.io).
+
+    Subscribes to `depth_whole` (snapshots) and `depth_diff` (deltas).
+    Deltas are buffered until a snapshot arrives, then only deltas whose
+    sequence id is newer than the book are applied. A delta whose sequence id
+    is not newer than the previous delta means the stream is out of order:
+    the book is cleared and both rooms are rejoined.
+
+    [References]
+    APIドキュメント: https://github.com/bitbankinc/bitbank-api-docs/blob/master/public-stream_JP.md
+
+    """
+
+    exchange_name: str = "bitbank"
+    url: str = "wss://stream.bitbank.cc/socket.io/?EIO=4&transport=websocket"
+    # the server pings every 25 seconds, so a longer silence is a dead connection
+    stall_timeout: float = 60.0
+
+    # pending deltas kept per symbol while waiting for a snapshot
+    max_pending: int = 1000
+
+    def __init__(self, symbols: list[str], url: str | None = None) -> None:
+        super().__init__(symbols, url)
+
+        self.pending: dict[str, list[dict]] = {s: [] for s in symbols}
+        # sequence id of the last applied delta, None until one is applied
+        self.last_diff: dict[str, int | None] = {s: None for s in symbols}
+
+    def reset(self) -> None:
+        super().reset()
+
+        for pending in self.pending.values():
+            pending.clear()
+
+        for symbol in self.last_diff:
+            self.last_diff[symbol] = None
+
+    def initial_messages(self) -> list[str]:
+        # rooms are joined once the socket.io handshake completes
+        return []
+
+    @staticmethod
+    def _rooms(symbol: str) -> tuple[str, str]:
+        return (f"depth_whole_{symbol}", f"depth_diff_{symbol}")
+
+    def _join_messages(self) -> list[str]:
+
+        messages = []
+        for s in self.symbols:
+            for room in self._rooms(s):
+                messages.append("42" + json.dumps(["join-room", room]))
+
+        return messages
+
+    def feed(self, frame: str) -> list[str]:
+
+        # engine.io open -> socket.io connect
+        if frame.startswith("0"):
+            return ["40"]
+
+        # socket.io connected -> join rooms
+        if frame.startswith("40"):
+            return self._join_messages()
+
+        # engine.io ping -> pong
+        if frame == "2":
+            return ["3"]
+
+        if not frame.startswith("42"):
+            return []
+
+        event, payload = json.loads(frame[2:])
+        if event != "message":
+            return []
+
+        room = payload["room_name"]
+        data = payload["message"]["data"]
+
+        if room.startswith("depth_whole_"):
+            return self._on_whole(room[len("depth_whole_") :], data)
+
+        if room.startswith("depth_diff_"):
+            return self._on_diff(room[len("depth_diff_") :], data)
+
+        return []
+
+    def _on_whole(self, symbol: str, data: dict) -> list[str]:
+
+        if symbol not in self.books:
+            return []
+
+        book = self.books[symbol]
+        seq = int(data["sequenceId"])
+
+        # a snapshot older than the applied deltas would undo them
+        if book.seq is not None and seq < book.seq:
+            return []
+
+        book.apply_snapshot(
+            asks=data["asks"],
+            bids=data["bids"],
+            seq=seq,
+            server_ts=data["timestamp"] / 1000,
+        )
+        self.last_diff[symbol] = None
+
+        # replay the deltas that are newer than the snapshot
+        pending, self.pending[symbol] = self.pending[symbol], []
+        for diff in sorted(pending, key=lambda d: int(d["s"])):
+            self._apply_diff(symbol, diff)
+
+        return []
+
+    def _on_diff(self, symbol: str, data: dict) -> list[str]:
+
+        if symbol not in self.books:
+            return []
+
+        if self.books[symbol].seq is None:
+            pending = self.pending[symbol]
+            pending.append(data)
+            if len(pending) > self.max_pending:
+                pending.pop(0)
+            return []
+
+        return self._apply_diff(symbol, data)
+
+    def _apply_diff(self, symbol: str, data: dict) -> list[str]:
+
+        book = self.books[symbol]
+
+        seq = int(data["s"])
+        last = self.last_diff[symbol]
+        if last is not None and seq <= last:
+            return self._resync(symbol)
+
+        # older than the snapshot
+        if seq <= book.seq:
+            return []
+
+        book.apply_delta(
+            asks=data["a"],
+            bids=data["b"],
+            seq=seq,
+            server_ts=data["t"] / 1000,
+        )
+        self.last_diff[symbol] = seq
+
+        return []
+
+    def _resync(self, symbol: str) -> list[str]:
+
+        self.books[symbol].clear()
+        self.pending[symbol].clear()
+        self.last_diff[symbol] = None
+        self.resyncs += 1
+
+        rooms = self._rooms(symbol)
+        return [
+            *("42" + json.dumps(["leave-room", room]) for room in rooms),
+            *("42" + json.dumps(["join-room", room]) for room in rooms),
+        ]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+
+from ..models.core import ModelIdentifier
+from .core import OrderbookChannel
+
+
+class BybitOrderbookChannel(OrderbookChannel):
+    """Orderbook channel for bybit public WebSocket API (V5).
+
+    Deltas must have consecutive update ids (`u`). On a gap the book is
+    cleared and the topic is resubscribed to receive a fresh snapshot.
+
+    [References]
+    APIドキュメント(V5): https://bybit-exchange.github.io/docs/v5/websocket/public/orderbook
+
+    """
+
+    exchange_name: str = "bybit"
+    url: str = "wss://stream.bybit.com/v5/public/{category}"
+    ping_interval: float = 20.0
+
+    def __init__(
+        self,
+        symbols: list[str],
+        category: str = "spot",
+        depth: int = 50,
+        url: str | None = None,
+    ) -> None:
+        super().__init__(symbols, url)
+
+        self.category = category
+        self.depth = depth
+        self.url = self.url.format(category=category)
+
+    def model_identifier(self, symbol: str) -> ModelIdentifier:
+        return ModelIdentifier.intern(
+            exchange_name=self.exchange_name,
+            data_type="orderbooks",
+            arguments={"symbol": symbol, "category": self.category},
+        )
+
+    def _topic(self, symbol: str) -> str:
+        return f"orderbook.{self.depth}.{symbol}"
+
+    def initial_messages(self) -> list[str]:
+        return [
+            json.dumps({"op": "subscribe", "args": [self._topic(s) for s in self.symbols]})
+        ]
+
+    def ping_message(self) -> str | None:
+        return json.dumps({"op": "ping"})
+
+    def feed(self, frame: str) -> list[str]:
+
+        msg = json.loads(frame)
+        if "topic" not in msg or "data" not in msg:
+            return []
+
+        data = msg["data"]
+        symbol = data["s"]
+        if symbol not in self.books:
+            return []
+
+        book = self.books[symbol]
+        seq = int(data["u"])
+        server_ts = msg["ts"] / 1000
+
+        if msg["type"] == "snapshot":
+            book.apply_snapshot(asks=data["a"], bids=data["b"], seq=seq, server_ts=server_ts)
+            return []
+
+        # waiting for the snapshot after (re)subscribing
+        if book.seq is None:
+            return []
+
+        if seq != book.seq + 1:
+            return self._resync(symbol)
+
+        book.apply_delta(asks=data["a"], bids=data["b"], seq=seq, server_ts=server_ts)
+
+        return []
+
+    def _resync(self, symbol: str) -> list[str]:
+
+        self.books[symbol].clear()
+        self.resyncs += 1
+
+        topic = self._topic(symbol)
+        return [
+            json.dumps({"op": "unsubscribe", "args": [topic]}),
+            json.dumps({"op": "subscribe", "args": [topic]}),
+        ]
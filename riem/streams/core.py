@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+from typing import Iterable
+
+from .. import clock
+from ..formats.molds.orderbook import Book, Orderbook
+from ..models.core import ModelIdentifier
+
+
+class LocalBook:
+    """LocalBook
+
+    Locally maintained orderbook (ローカル板情報).
+    Keeps price -> size maps for both sides and applies snapshots and deltas.
+    A level whose size is zero is removed.
+
+    Attributes:
+        asks (dict[str, str]): Ask price -> size.
+        bids (dict[str, str]): Bid price -> size.
+        seq (int | None): Sequence number of the last applied message.
+        server_ts (float | None): Exchange timestamp of the last applied message.
+        updated (float | None): Local UNIX timestamp of the last applied message.
+
+    """
+
+    def __init__(self) -> None:
+
+        self.asks: dict[str, str] = {}
+        self.bids: dict[str, str] = {}
+        self.seq: int | None = None
+        self.server_ts: float | None = None
+        self.updated: float | None = None
+
+        self._sorted: tuple[list[tuple[str, str]], list[tuple[str, str]]] | None = None
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.asks) and bool(self.bids)
+
+    def clear(self) -> None:
+
+        self.asks.clear()
+        self.bids.clear()
+        self.seq = None
+        self.server_ts = None
+        self.updated = None
+        self._sorted = None
+
+    @staticmethod
+    def _update(side: dict[str, str], levels: Iterable[tuple[str, str]]) -> None:
+
+        for price, size in levels:
+            if float(size) == 0:
+                side.pop(price, None)
+            else:
+                side[price] = size
+
+    def apply_snapshot(
+        self,
+        asks: Iterable[tuple[str, str]],
+        bids: Iterable[tuple[str, str]],
+        seq: int | None = None,
+        server_ts: float | None = None,
+    ) -> None:
+
+        self.clear()
+        self.apply_delta(asks, bids, seq, server_ts)
+
+    def apply_delta(
+        self,
+        asks: Iterable[tuple[str, str]],
+        bids: Iterable[tuple[str, str]],
+        seq: int | None = None,
+        server_ts: float | None = None,
+    ) -> None:
+
+        self._update(self.asks, asks)
+        self._update(self.bids, bids)
+        self.seq = seq
+        self.server_ts = server_ts
+        self.updated = clock.now()
+        self._sorted = None
+
+    def levels(self, depth: int) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+        """levels
+
+        Best `depth` levels of each side (最良気配から depth 件).
+
+        Returns:
+            tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+                Asks in ascending and bids in descending price order.
+
+        """
+
+        if self._sorted is None:
+            self._sorted = (
+                sorted(self.asks.items(), key=lambda x: float(x[0])),
+                sorted(self.bids.items(), key=lambda x: float(x[0]), reverse=True),
+            )
+
+        asks, bids = self._sorted
+        return asks[:depth], bids[:depth]
+
+    def to_orderbook(self, depth: int) -> Orderbook:
+
+        asks, bids = self.levels(depth)
+        return Orderbook(asks=Book(book=asks), bids=Book(book=bids))
+
+
+class OrderbookChannel(metaclass=ABCMeta):
+    """OrderbookChannel
+
+    ABC for the public orderbook WebSocket channel of an exchange
+    (取引所の板情報WebSocketチャンネルの抽象基底クラス).
+    A channel only parses frames and updates its books, so it can be fed
+    recorded frames without a connection.
+
+    Attributes:
+        url (str): WebSocket endpoint.
+        symbols (list[str]): Subscribed symbols.
+        books (dict[str, LocalBook]): Local books per symbol.
+        subscribe_interval (float): Seconds to wait between subscribe messages.
+        ping_interval (float | None): Seconds between application-level pings.
+        stall_timeout (float | None): Seconds without any frame after which the
+            connection is considered stalled and is reconnected.
+        resyncs (int): Number of resyncs caused by sequence gaps.
+
+    """
+
+    exchange_name: str
+    url: str
+    subscribe_interval: float = 0.0
+    ping_interval: float | None = None
+    stall_timeout: float | None = None
+
+    def __init__(self, symbols: list[str], url: str | None = None) -> None:
+
+        if url is not None:
+            self.url = url
+
+        self.symbols = symbols
+        self.books: dict[str, LocalBook] = {s: LocalBook() for s in symbols}
+        self.resyncs = 0
+
+    def reset(self) -> None:
+
+        for book in self.books.values():
+            book.clear()
+
+    def model_identifier(self, symbol: str) -> ModelIdentifier:
+        return ModelIdentifier.intern(
+            exchange_name=self.exchange_name,
+            data_type="orderbooks",
+            arguments={"symbol": symbol},
+        )
+
+    def ping_message(self) -> str | None:
+        return None
+
+    @abstractmethod
+    def initial_messages(self) -> list[str]:
+        """Frames to send right after connecting."""
+        pass
+
+    @abstractmethod
+    def feed(self, frame: str) -> list[str]:
+        """feed
+
+        Apply a received text frame to the local books (受信フレームを適用).
+
+        Args:
+            frame (str): Text frame.
+
+        Returns:
+            list[str]: Frames to send back (pong, resubscribe, ...).
+
+        """
+        pass
+
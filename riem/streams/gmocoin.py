@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+
+from ..timing import parse_iso_ts
+from .core import OrderbookChannel
+
+
+class GmocoinOrderbookChannel(OrderbookChannel):
+    """Orderbook channel for gmocoin public WebSocket API.
+
+    Every message is a full snapshot, so there is no sequence to verify.
+
+    [References]
+    APIドキュメント: https://api.coin.z.com/docs/#ws-orderbooks
+    API制限: 同一IPから1秒間に1回の購読リクエスト
+
+    """
+
+    exchange_name: str = "gmocoin"
+    url: str = "wss://api.coin.z.com/ws/public/v1"
+    subscribe_interval: float = 1.0
+
+    def initial_messages(self) -> list[str]:
+        return [
+            json.dumps({"command": "subscribe", "channel": "orderbooks", "symbol": s})
+            for s in self.symbols
+        ]
+
+    def feed(self, frame: str) -> list[str]:
+
+        msg = json.loads(frame)
+        if msg.get("channel") != "orderbooks" or msg.get("symbol") not in self.books:
+            return []
+
+        self.books[msg["symbol"]].apply_snapshot(
+            asks=[(a["price"], a["size"]) for a in msg["asks"]],
+            bids=[(b["price"], b["size"]) for b in msg["bids"]],
+            server_ts=parse_iso_ts(msg["timestamp"]),
+        )
+
+        return []
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import aiohttp
+
+from ..models.core import RequestContents
+from ..response import ClientResponse, ClientResponseProxy
+from .core import OrderbookChannel
+
+logger = logging.getLogger(__name__)
+
+_CLOSED = (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.CLOSED)
+
+
+class OrderbookStream:
+    """OrderbookStream
+
+    WebSocket orderbook ingestion (WebSocketによる板情報の取得).
+    Keeps one connection per channel, reconnects on failure and exposes the
+    local books as ClientResponse with the same modelhash as the REST
+    `get_orderbooks` requests.
+
+    Attributes:
+        channels (list[OrderbookChannel]): Exchange channels.
+        depth (int): Number of levels per side in the formatted Orderbook.
+        reconnect_delay (float): Seconds to wait before reconnecting.
+
+    Example:
+        async with OrderbookStream(GmocoinOrderbookChannel(["BTC"])) as stream:
+            await stream.wait_ready()
+            crp = stream.mfind(Gmocoin.get_orderbooks(symbol="BTC"))
+
+    """
+
+    def __init__(
+        self,
+        *channels: OrderbookChannel,
+        depth: int = 10,
+        reconnect_delay: float = 1.0,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+
+        self.channels = list(channels)
+        self.depth = depth
+        self.reconnect_delay = reconnect_delay
+
+        self._session = session
+        self._own_session = session is None
+        self._tasks: list[asyncio.Task] = []
+        self._updated = asyncio.Event()
+
+    async def __aenter__(self) -> OrderbookStream:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        for channel in self.channels:
+            self._tasks.append(asyncio.create_task(self._run(channel)))
+
+    async def close(self) -> None:
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._own_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _run(self, channel: OrderbookChannel) -> None:
+
+        while True:
+            try:
+                await self._connect(channel)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning("%s stream disconnected: %r", channel.exchange_name, e)
+            except Exception:
+                # e.g. a malformed frame: rebuild the books rather than end the channel
+                logger.exception("%s stream failed", channel.exchange_name)
+
+            channel.reset()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _connect(self, channel: OrderbookChannel) -> None:
+
+        async with self._session.ws_connect(channel.url) as ws:
+            channel.reset()
+
+            pinger = None
+            if channel.ping_interval is not None:
+                pinger = asyncio.create_task(self._ping(ws, channel))
+
+            try:
+                for i, message in enumerate(channel.initial_messages()):
+                    if i and channel.subscribe_interval:
+                        await asyncio.sleep(channel.subscribe_interval)
+                    await ws.send_str(message)
+
+                while True:
+                    # raises asyncio.TimeoutError when the stream stalls
+                    msg = await ws.receive(timeout=channel.stall_timeout)
+                    if msg.type in _CLOSED:
+                        break
+
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        continue
+
+                    for reply in channel.feed(msg.data):
+                        await ws.send_str(reply)
+
+                    self._updated.set()
+
+            finally:
+                if pinger is not None:
+                    pinger.cancel()
+
+    async def _ping(self, ws: aiohttp.ClientWebSocketResponse, channel: OrderbookChannel) -> None:
+
+        while True:
+            await asyncio.sleep(channel.ping_interval)
+            await ws.send_str(channel.ping_message())
+
+    async def wait_updated(self) -> None:
+        """Wait until any channel receives a new message."""
+
+        self._updated.clear()
+        await self._updated.wait()
+
+    async def wait_ready(self) -> None:
+        """Wait until every subscribed book has both sides."""
+
+        while not all(
+            book.ready for channel in self.channels for book in channel.books.values()
+        ):
+            await self.wait_updated()
+
+    def _responses(self) -> list[ClientResponse]:
+
+        responses = []
+        for channel in self.channels:
+            for symbol, book in channel.books.items():
+                if not book.ready:
+                    continue
+
+                asks, bids = book.levels(self.depth)
+                cr = ClientResponse(
+                    model_identifier=channel.model_identifier(symbol),
+                    acq_source="WS",
+                    raw_data={"asks": asks, "bids": bids},
+                    formatted_data=book.to_orderbook(self.depth),
+                    server_ts=book.server_ts,
+                )
+                cr.ts = book.updated
+                responses.append(cr)
+
+        return responses
+
+    @property
+    def crp(self) -> ClientResponseProxy:
+        """Current books of every channel."""
+
+        return ClientResponseProxy(responses=self._responses())
+
+    def mfind(self, *requests: RequestContents) -> ClientResponseProxy:
+        """Current books matching the modelhash of the requests."""
+
+        keys = {r.model_identifier.modelkey for r in requests}
+        return ClientResponseProxy(
+            responses=[r for r in self._responses() if r.modelkey in keys]
+        )
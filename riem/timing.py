@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+from typing import Any
+
+
+@dataclasses.dataclass(slots=True)
+class StageTimings:
+    """StageTimings
+
+    Monotonic timestamps of each stage of a response (ステージごとの時刻).
+    All values come from `time.monotonic()` and are None if the stage
+    was not reached. Only responses fetched by riem.Client have timings.
+
+    Attributes:
+        enqueued (float | None): Request entered the client.
+        sent (float | None): Request left the rate limiter and was sent.
+        first_byte (float | None): Response headers were received.
+        decoded (float | None): Response body was read and decoded
+            (only read if the client keeps raw bodies).
+        formatted (float | None): Response was converted by the Formatter
+            (on first access of formatted_data with a lazy Formatter).
+        persisted (float | None): Response was committed to the database.
+
+    """
+
+    enqueued: float | None = None
+    sent: float | None = None
+    first_byte: float | None = None
+    decoded: float | None = None
+    formatted: float | None = None
+    persisted: float | None = None
+
+    @staticmethod
+    def _span(start: float | None, end: float | None) -> float | None:
+
+        if start is None or end is None:
+            return None
+
+        return end - start
+
+    @property
+    def breakdown(self) -> dict[str, float | None]:
+        """Duration of each stage in seconds."""
+
+        return {
+            "queue": self._span(self.enqueued, self.sent),
+            "network": self._span(self.sent, self.first_byte),
+            "decode": self._span(self.first_byte, self.decoded),
+            "format": self._span(self.decoded, self.formatted),
+            "persist": self._span(self.formatted, self.persisted),
+        }
+
+
+def parse_iso_ts(text: str) -> float:
+    # python 3.10 can't parse the "Z" suffix
+    return datetime.datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+
+
+def parse_server_ts(exchange_name: str, raw_data: Any) -> float | None:
+    """parse_server_ts
+
+    Extract the exchange server timestamp from the payload
+    (ペイロードからサーバー時刻を取得).
+
+    Args:
+        exchange_name (str): Exchange name.
+        raw_data (Any): Raw data decoded from JSON.
+
+    Returns:
+        float | None: UNIX timestamp in seconds, or None if the payload has none.
+
+    """
+
+    try:
+        if exchange_name in ("gmocoin", "gmocoinfx"):
+            return parse_iso_ts(raw_data["responsetime"])
+
+        if exchange_name == "bitbank":
+            return raw_data["data"]["timestamp"] / 1000
+
+        if exchange_name == "bybit":
+            return raw_data["time"] / 1000
+
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    return None
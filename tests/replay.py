@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+
+class ReplayServer:
+    """ReplayServer
+
+    Local stand-in WebSocket server that replays recorded frames
+    (記録したフレームを再生するWebSocketサーバー).
+    Point a channel at `url` to run it without the exchange.
+
+    A script is a list of steps. `{"close": true}` ends a connection, and the
+    next connection continues with the steps after it, so reconnects and
+    resubscriptions can be replayed. Once the script is exhausted, further
+    connections only record what they receive.
+
+    Steps:
+        {"send": str | dict | list}: Send a text frame. Non-str frames are JSON-encoded.
+        {"expect": str}: Wait for a client frame containing the text.
+        {"sleep": float}: Wait for the given seconds.
+        {"close": true}: Close the connection.
+
+    Attributes:
+        segments (list[list[dict]]): Steps per connection.
+        expect_timeout (float): Seconds to wait for an expected frame.
+        received (list[str]): Text frames received from clients.
+        errors (list[str]): Expected frames that never arrived.
+        connections (int): Number of accepted connections.
+        url (str): WebSocket URL, once started.
+
+    Example:
+        async with ReplayServer.from_jsonl("bybit.jsonl") as server:
+            channel = BybitOrderbookChannel(["BTCUSDT"], url=server.url)
+            async with OrderbookStream(channel) as stream:
+                await server.wait_replayed()
+
+    """
+
+    def __init__(
+        self,
+        script: list[dict[str, Any]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        expect_timeout: float = 5.0,
+    ) -> None:
+
+        self.segments: list[list[dict[str, Any]]] = [[]]
+        for step in script:
+            self.segments[-1].append(step)
+            if step.get("close"):
+                self.segments.append([])
+
+        if not self.segments[-1] and len(self.segments) > 1:
+            self.segments.pop()
+
+        self.host = host
+        self.port = port
+        self.expect_timeout = expect_timeout
+
+        self.received: list[str] = []
+        self.errors: list[str] = []
+        self.connections = 0
+        self.url = ""
+
+        self._runner: web.AppRunner | None = None
+        self._replayed = 0
+        self._replayed_event = asyncio.Event()
+
+    @classmethod
+    def from_jsonl(cls, path: str | Path, **kwargs) -> ReplayServer:
+        """Load a script with one step per line. Blank lines and lines starting with # are skipped."""
+
+        script = []
+        for line in Path(path).read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                script.append(json.loads(line))
+
+        return cls(script, **kwargs)
+
+    async def __aenter__(self) -> ReplayServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"ws://{host}:{port}/"
+
+    async def close(self) -> None:
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def wait_replayed(self, timeout: float = 5.0) -> None:
+        """Wait until every step of the script has been replayed."""
+
+        await asyncio.wait_for(self._replayed_event.wait(), timeout)
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        index = self.connections
+        self.connections += 1
+
+        if index < len(self.segments):
+            for step in self.segments[index]:
+                await self._step(ws, step)
+                if ws.closed:
+                    break
+
+            self._replayed += 1
+            if self._replayed == len(self.segments):
+                self._replayed_event.set()
+
+        if not ws.closed:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    self.received.append(msg.data)
+
+        return ws
+
+    async def _step(self, ws: web.WebSocketResponse, step: dict[str, Any]) -> None:
+
+        if "send" in step:
+            frame = step["send"]
+            await ws.send_str(frame if isinstance(frame, str) else json.dumps(frame))
+
+        elif "expect" in step:
+            await self._expect(ws, step["expect"])
+
+        elif "sleep" in step:
+            await asyncio.sleep(step["sleep"])
+
+        elif step.get("close"):
+            await ws.close()
+
+    async def _expect(self, ws: web.WebSocketResponse, text: str) -> None:
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.expect_timeout
+
+        while True:
+            try:
+                msg = await ws.receive(timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                msg = None
+
+            if msg is None or msg.type != aiohttp.WSMsgType.TEXT:
+                # the rest of the script can't be replayed on this connection
+                self.errors.append(f"expected {text!r}")
+                await ws.close()
+                return
+
+            self.received.append(msg.data)
+            if text in msg.data:
+                return
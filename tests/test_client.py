@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import web
+
+import riem
+
+
+def _orderbook(depth: int = 3) -> dict:
+
+    return {
+        "status": 0,
+        "data": {
+            "asks": [{"price": str(100 + i), "size": "1"} for i in range(depth)],
+            "bids": [{"price": str(99 - i), "size": "1"} for i in range(depth)],
+        },
+        "responsetime": "2024-01-01T00:00:00.000Z",
+    }
+
+
+class LocalExchange:
+    """Local stand-in for the gmocoin public orderbooks endpoint.
+
+    Each request takes the next entry of `delays` (seconds) and `statuses`;
+    once they run out it answers at once with 200. A delayed request returns
+    early when `release` is set, so that no handler outlives the test.
+
+    """
+
+    def __init__(self) -> None:
+
+        self.delays: list[float] = []
+        self.statuses: list[int] = []
+        self.hits = 0
+        self.release = asyncio.Event()
+
+        self._runner: web.AppRunner | None = None
+        self.model: type[riem.Gmocoin] = riem.Gmocoin
+
+    async def __aenter__(self) -> LocalExchange:
+
+        app = web.Application()
+        app.router.add_get("/public/v1/orderbooks", self._handle)
+
+        self._runner = web.AppRunner(app, shutdown_timeout=0.1)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.model = type(
+            "LocalGmocoin", (riem.Gmocoin,), {"public_endpoint": f"http://{host}:{port}/public"}
+        )
+        return self
+
+    async def __aexit__(self, *args) -> None:
+
+        self.release.set()
+        await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+
+        self.hits += 1
+        delay = self.delays.pop(0) if self.delays else 0.0
+        status = self.statuses.pop(0) if self.statuses else 200
+
+        if delay:
+            try:
+                await asyncio.wait_for(self.release.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+        return web.json_response(_orderbook(), status=status)
+
+    def orderbooks(self, symbol: str = "BTC") -> riem.RequestContents:
+        return self.model.get_orderbooks(symbol=symbol)
+
+
+def _client(**kwargs) -> riem.Client:
+    return riem.Client(riem.Formatter(riem.OrderbookConverter(3)), **kwargs)
+
+
+async def _until(condition, timeout: float = 5.0) -> None:
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def test_coalesced_flight_survives_a_cancelled_waiter():
+
+    async def run() -> None:
+
+        async with LocalExchange() as exchange, _client() as client:
+            exchange.delays = [0.2]
+
+            first = asyncio.ensure_future(client.fetch(exchange.orderbooks()))
+            second = asyncio.ensure_future(client.fetch(exchange.orderbooks()))
+            await _until(lambda: exchange.hits == 1)
+
+            first.cancel()
+            crp = await second
+
+            assert exchange.hits == 1
+            assert len(crp) == 1
+            assert crp[0].formatted_data.asks.book[0] == ("100", "1")
+
+    asyncio.run(run())
+
+
+def test_last_waiter_cancelling_a_coalesced_flight_cancels_the_request():
+
+    async def run() -> None:
+
+        async with LocalExchange() as exchange, _client() as client:
+            exchange.delays = [10.0]
+
+            waiters = [asyncio.ensure_future(client.fetch(exchange.orderbooks())) for _ in range(2)]
+            await _until(lambda: exchange.hits == 1)
+            flights = [flight.task for flight in client._inflight.values()]
+
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            await asyncio.sleep(0)
+
+            assert flights and all(task.cancelled() for task in flights)
+            assert client._inflight == {}
+
+            # the next fetch is not joined to the cancelled flight
+            crp = await client.fetch(exchange.orderbooks())
+            assert exchange.hits == 2
+            assert len(crp) == 1
+
+    asyncio.run(run())
+
+
+def _primed_hedger(latency: float = 0.01) -> riem.Hedger:
+
+    hedger = riem.Hedger(min_samples=5)
+    for _ in range(20):
+        hedger.record("gmocoin", latency)
+
+    return hedger
+
+
+def test_hedge_that_wins_is_counted_and_the_loser_recorded():
+
+    async def run() -> None:
+
+        hedger = _primed_hedger()
+        async with LocalExchange() as exchange, _client(hedger=hedger, coalesce=False) as client:
+            # the primary hangs, the hedge answers at once
+            exchange.delays = [10.0]
+            crp = await client.fetch(exchange.orderbooks())
+
+            assert len(crp) == 1
+            assert exchange.hits == 2
+            assert (hedger.requests, hedger.fired, hedger.won) == (1, 1, 1)
+
+            # the winner, then the cancelled primary as a lower bound
+            latencies = hedger._latencies["gmocoin"]
+            await _until(lambda: len(latencies) == 22)
+            assert latencies[-1] >= 0.01
+
+    asyncio.run(run())
+
+
+def test_hedge_that_loses_is_not_counted_as_won():
+
+    async def run() -> None:
+
+        hedger = _primed_hedger()
+        async with LocalExchange() as exchange, _client(hedger=hedger, coalesce=False) as client:
+            # the primary is slower than the hedge delay, the hedge hangs
+            exchange.delays = [0.1, 10.0]
+            crp = await client.fetch(exchange.orderbooks())
+
+            assert len(crp) == 1
+            assert exchange.hits == 2
+            assert (hedger.requests, hedger.fired, hedger.won) == (1, 1, 0)
+
+    asyncio.run(run())
+
+
+def test_no_hedge_while_throttled():
+
+    async def run() -> None:
+
+        hedger = _primed_hedger()
+        limiter = riem.RateLimiter({"gmocoin": {"public": riem.RateLimit(rate=1, capacity=1)}})
+        async with LocalExchange() as exchange, _client(
+            hedger=hedger, rate_limiter=limiter, coalesce=False
+        ) as client:
+            exchange.delays = [0.1]
+            crp = await client.fetch(exchange.orderbooks())
+
+            assert len(crp) == 1
+            assert exchange.hits == 1
+            assert (hedger.fired, hedger.throttled) == (0, 1)
+
+    asyncio.run(run())
+
+
+def _tripped_breakers(**kwargs) -> riem.CircuitBreakerRegistry:
+    return riem.CircuitBreakerRegistry(min_calls=1, failure_rate=0.5, open_timeout=0.05, **kwargs)
+
+
+def test_cancelled_half_open_probe_reopens_the_breaker():
+
+    async def run() -> None:
+
+        breakers = _tripped_breakers()
+        async with LocalExchange() as exchange, _client(breakers=breakers) as client:
+            exchange.statuses = [500]
+            await client.fetch(exchange.orderbooks())
+
+            breaker = breakers.breakers["gmocoin"]
+            assert breaker.state == "open"
+
+            await asyncio.sleep(0.1)
+            assert breaker.state == "half_open"
+
+            # the probe hangs and its caller gives up
+            exchange.delays = [10.0]
+            probe = asyncio.ensure_future(client.fetch(exchange.orderbooks()))
+            await _until(lambda: exchange.hits == 2)
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+
+            assert breaker.state == "open"
+            assert breaker.opened == 2
+
+            # the probe slot was released: the next probe goes through and closes it
+            await asyncio.sleep(0.1)
+            crp = await client.fetch(exchange.orderbooks())
+            assert len(crp) == 1
+            assert breaker.state == "closed"
+
+    asyncio.run(run())
+
+
+def test_call_timeout_counts_as_a_failure():
+
+    async def run() -> None:
+
+        breakers = _tripped_breakers(call_timeout=0.05)
+        async with LocalExchange() as exchange, _client(breakers=breakers) as client:
+            exchange.delays = [10.0]
+            crp = await client.fetch(exchange.orderbooks())
+
+            breaker = breakers.breakers["gmocoin"]
+            assert len(crp) == 0
+            assert breaker.timeouts == 1
+            assert breaker.state == "open"
+
+    asyncio.run(run())
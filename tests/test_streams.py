@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Callable
+
+import riem
+from replay import ReplayServer
+
+FIXTURES = Path(__file__).parent / "fixtures" / "streams"
+
+
+def _sent_frames(name: str) -> list[str]:
+
+    server = ReplayServer.from_jsonl(FIXTURES / f"{name}.jsonl")
+    return [
+        step["send"] if isinstance(step["send"], str) else json.dumps(step["send"])
+        for segment in server.segments
+        for step in segment
+        if "send" in step
+    ]
+
+
+async def _until(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def _replay(name: str, channel_factory, done: Callable) -> tuple:
+
+    async with ReplayServer.from_jsonl(FIXTURES / f"{name}.jsonl") as server:
+        channel = channel_factory(server.url)
+        async with riem.OrderbookStream(channel, depth=5, reconnect_delay=0.01) as stream:
+            await server.wait_replayed()
+            await _until(lambda: done(channel))
+            crp = stream.crp
+
+    assert server.errors == []
+    return server, channel, crp
+
+
+def test_gmocoin_snapshots_and_reconnect():
+
+    server, channel, crp = asyncio.run(
+        _replay(
+            "gmocoin",
+            lambda url: riem.GmocoinOrderbookChannel(["BTC"], url=url),
+            lambda ch: ch.books["BTC"].levels(1)[0] == [("10030000", "0.2")],
+        )
+    )
+
+    assert server.connections == 2
+    assert len(crp) == 1
+
+    cr = crp[0]
+    assert cr.acq_source == "WS"
+    assert cr.modelkey == riem.Gmocoin.get_orderbooks(symbol="BTC").model_identifier.modelkey
+    assert cr.formatted_data.asks.book == [("10030000", "0.2")]
+    assert cr.formatted_data.bids.book == [("10025000", "0.7")]
+    assert cr.server_ts == 1704067205.0
+
+
+def test_bybit_delta_gap_and_resync():
+
+    server, channel, crp = asyncio.run(
+        _replay(
+            "bybit",
+            lambda url: riem.BybitOrderbookChannel(["BTCUSDT"], url=url),
+            lambda ch: ch.books["BTCUSDT"].seq == 201,
+        )
+    )
+
+    assert channel.resyncs == 1
+    assert [f for f in server.received if "unsubscribe" in f] == [
+        '{"op": "unsubscribe", "args": ["orderbook.50.BTCUSDT"]}'
+    ]
+
+    # the book was rebuilt from the second snapshot; the gapped delta was dropped
+    ob = crp.mfind(riem.Bybit.get_orderbooks(symbol="BTCUSDT", category="spot"))[0].formatted_data
+    assert ob.asks.book == [("37004", "0.2"), ("37005", "3")]
+    assert ob.bids.book == [("37003.5", "0.9")]
+
+
+def test_bybit_delta_before_gap_is_applied():
+
+    channel = riem.BybitOrderbookChannel(["BTCUSDT"])
+    for frame in _sent_frames("bybit")[:2]:
+        channel.feed(frame)
+
+    asks, bids = channel.books["BTCUSDT"].levels(5)
+    assert asks == [("37002", "0.4"), ("37003", "1")]
+    assert bids == [("37000.5", "0.1"), ("37000", "0.8"), ("36999.5", "2")]
+
+
+def test_bitbank_buffered_deltas_out_of_order_and_rejoin():
+
+    server, channel, crp = asyncio.run(
+        _replay(
+            "bitbank",
+            lambda url: riem.BitbankOrderbookChannel(["btc_jpy"], url=url),
+            lambda ch: ch.books["btc_jpy"].seq == 11,
+        )
+    )
+
+    assert channel.resyncs == 1
+    assert "3" in server.received
+    assert any("leave-room" in f and "depth_diff_btc_jpy" in f for f in server.received)
+
+    ob = crp.mfind(riem.Bitbank.get_orderbooks(symbol="btc_jpy"))[0].formatted_data
+    assert ob.asks.book == [("5000300", "0.2"), ("5000400", "1")]
+    assert ob.bids.book == [("5000250", "0.6")]
+
+
+def test_bitbank_snapshot_replays_newer_buffered_deltas():
+
+    channel = riem.BitbankOrderbookChannel(["btc_jpy"])
+    # two deltas, then the snapshot
+    for frame in _sent_frames("bitbank")[2:5]:
+        channel.feed(frame)
+
+    book = channel.books["btc_jpy"]
+    assert book.seq == 6
+    # s=6 set 5000100 to 0.3 after the snapshot; s=4 was older and dropped
+    assert book.levels(5)[0] == [("5000100", "0.3"), ("5000200", "0.5")]
+
+
+def test_stalled_connection_is_reconnected():
+
+    def snapshot(price: str) -> dict:
+        return {
+            "channel": "orderbooks",
+            "symbol": "BTC",
+            "asks": [{"price": price, "size": "1"}],
+            "bids": [{"price": "1", "size": "1"}],
+            "timestamp": "2024-01-01T00:00:00.000Z",
+        }
+
+    # the first connection goes silent after its snapshot instead of closing
+    script = [
+        {"expect": "BTC"},
+        {"send": snapshot("2")},
+        {"sleep": 1.0},
+        {"close": True},
+        {"expect": "BTC"},
+        {"send": snapshot("3")},
+    ]
+
+    async def run() -> tuple:
+
+        async with ReplayServer(script) as server:
+            channel = riem.GmocoinOrderbookChannel(["BTC"], url=server.url)
+            channel.stall_timeout = 0.1
+            async with riem.OrderbookStream(channel, reconnect_delay=0.01):
+                await _until(lambda: channel.books["BTC"].levels(1)[0] == [("3", "1")])
+
+        return server, channel
+
+    server, channel = asyncio.run(run())
+
+    assert server.connections == 2
+
+
+def test_malformed_frame_is_reconnected():
+
+    snapshot = {
+        "channel": "orderbooks",
+        "symbol": "BTC",
+        "asks": [{"price": "3", "size": "1"}],
+        "bids": [{"price": "1", "size": "1"}],
+        "timestamp": "2024-01-01T00:00:00.000Z",
+    }
+
+    # the first connection sends a frame the channel can't parse
+    script = [
+        {"expect": "BTC"},
+        {"send": {"channel": "orderbooks", "symbol": "BTC"}},
+        {"sleep": 1.0},
+        {"close": True},
+        {"expect": "BTC"},
+        {"send": snapshot},
+    ]
+
+    async def run() -> tuple:
+
+        async with ReplayServer(script) as server:
+            channel = riem.GmocoinOrderbookChannel(["BTC"], url=server.url)
+            async with riem.OrderbookStream(channel, reconnect_delay=0.01) as stream:
+                await asyncio.wait_for(stream.wait_ready(), 5.0)
+
+        return server, channel
+
+    server, channel = asyncio.run(run())
+
+    assert server.connections == 2
+    assert channel.books["BTC"].levels(1)[0] == [("3", "1")]